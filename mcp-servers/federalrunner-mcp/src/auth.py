@@ -30,7 +30,12 @@ SELECTIVE AUTHENTICATION:
     for methods that require authentication.
 
 SECURITY FEATURES:
-    - JWKS caching to reduce Auth0 API calls
+    - JWKS caching to reduce Auth0 API calls (refreshed ahead of expiry in the
+      background; an unknown kid forces one refresh to pick up key rotation)
+    - Validated-token cache (keyed by a BLAKE2b digest of the token, never the raw
+      token; entries expire at the token's exp or AUTH_TOKEN_CACHE_TTL)
+    - Short negative cache for rejected tokens (AUTH_NEGATIVE_CACHE_TTL), so a
+      replayed bad token is refused without repeating RSA work or Auth0 calls
     - Token signature verification for JWT tokens
     - Audience and issuer validation
     - Scope-based authorization
@@ -39,12 +44,20 @@ SECURITY FEATURES:
 For Auth0 configuration, see .env file and requirements/execution/AUTH0_CONFIGURATION_REQUIREMENTS.md
 """
 
+import asyncio
+import base64
+import hashlib
 import httpx
+import orjson
 import os
-from jose import jwt, JWTError
-from typing import Dict
+import re
+import time
+from collections import OrderedDict
+import jwt
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from typing import Dict, FrozenSet, Optional, Tuple
 from fastapi import HTTPException
-from functools import lru_cache
 
 from .logging_config import get_logger
 
@@ -60,6 +73,18 @@ class AuthSettings:
     AUTH0_ISSUER = os.getenv("AUTH0_ISSUER", "")
     AUTH0_API_AUDIENCE = os.getenv("AUTH0_API_AUDIENCE", "")
 
+    # Validated-token cache: max seconds a token is trusted without re-validation,
+    # and max number of cached tokens (least recently used are evicted first).
+    # Kept short: it is also how long a token revoked at Auth0 stays accepted
+    TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "5"))
+    TOKEN_CACHE_MAX_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_MAX_SIZE", "10000"))
+
+    # Seconds a rejected token is refused without re-validation (keep short)
+    NEGATIVE_CACHE_TTL = float(os.getenv("AUTH_NEGATIVE_CACHE_TTL", "30"))
+
+    # JWKS cache lifetime in seconds (refreshed in the background before it expires)
+    JWKS_CACHE_TTL = float(os.getenv("AUTH_JWKS_CACHE_TTL", "300"))
+
     def __init__(self):
         """Validate that required Auth0 environment variables are set."""
         if not self.AUTH0_DOMAIN:
@@ -73,20 +98,275 @@ class AuthSettings:
 # Global settings instance
 settings = AuthSettings()
 
+# Settings used on every validation, bound once at import
+_ISSUER = settings.AUTH0_ISSUER
+_AUDIENCE = settings.AUTH0_API_AUDIENCE
+_AUTH0_BASE_URL = f"https://{settings.AUTH0_DOMAIN}"
+_JWKS_URL = f"{_AUTH0_BASE_URL}/.well-known/jwks.json"
+_USERINFO_URL = f"{_AUTH0_BASE_URL}/userinfo"
+
+# Payload returned for userinfo-validated tokens (see validate_via_userinfo)
+_USERINFO_ISSUER = _ISSUER.rstrip('/')
+
+# "Authorization: Bearer <token>" - the scheme name is case-insensitive (RFC 7235)
+_BEARER_RE = re.compile(r"^\s*bearer\s+(\S+)\s*$", re.IGNORECASE)
+
+# Plausible bearer token lengths (Auth0 opaque tokens are ~32 chars, JWT/JWE
+# access tokens ~1-2KB). Anything outside is rejected before any decoding or
+# hashing, which also bounds the size of what reaches the token caches.
+MIN_TOKEN_LENGTH = 20
+MAX_TOKEN_LENGTH = 8192
+
+
+class TokenRejected(HTTPException):
+    """
+    401 for a token that is definitely invalid (bad signature or claims,
+    unknown kid, refused by userinfo) - as opposed to Auth0 being unreachable.
+    Only these are negatively cached.
+    """
+
+    def __init__(self, detail: str):
+        super().__init__(status_code=401, detail=detail)
+
+
+# Shared async HTTP client for Auth0 (JWKS + userinfo): keep-alive connections
+# are reused, so only the first call pays for DNS resolution and the TLS
+# handshake, and requests never block the event loop
+_http_client = httpx.AsyncClient(
+    base_url=_AUTH0_BASE_URL,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared Auth0 HTTP client (called on server shutdown)."""
+    await _http_client.aclose()
+
+
+# JWKS fetched from Auth0 and when (see get_jwks), plus its RSA public keys
+# indexed by kid - built once per refresh, not per request
+_jwks: Optional[Dict] = None
+_keys_by_kid: Dict[str, RSAPublicKey] = {}
+_jwks_fetched_at = 0.0
+_jwks_lock = asyncio.Lock()
+_jwks_refresh_task: Optional[asyncio.Task] = None
+
+# Background refresh runs this many seconds before the cached JWKS expires
+JWKS_REFRESH_AHEAD = 30.0
+
+# An unknown kid forces a JWKS refresh at most this often, so tokens with
+# made-up kids can't turn every request into an Auth0 call
+JWKS_MIN_REFRESH_INTERVAL = 30.0
+
+# Validated tokens: blake2b(token) -> (payload, expires_at), and rejected
+# tokens: blake2b(token) -> expires_at.
+# Only touched from the event loop thread, so no lock is needed.
+_token_cache: "OrderedDict[bytes, Tuple[Dict, float]]" = OrderedDict()
+_rejected_tokens: "OrderedDict[bytes, float]" = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """
+    Cache key for a token - a 128-bit BLAKE2b digest, so raw tokens are never stored.
+
+    BLAKE2b is faster than SHA-256 on 1-2KB tokens, and 128 bits keeps
+    collisions negligible for a cache of this size. The raw digest bytes are
+    the dict key (no hex encoding).
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _get_cached_payload(cache_key: bytes) -> Optional[Dict]:
+    """
+    Return the payload of a previously validated token, if still fresh.
+
+    Args:
+        cache_key: Key from _token_cache_key()
+
+    Returns:
+        Cached token payload, or None if not cached or expired
+    """
+    entry = _token_cache.get(cache_key)
+    if entry is None:
+        return None
+
+    payload, expires_at = entry
+    if expires_at <= time.time():
+        del _token_cache[cache_key]
+        return None
+
+    _token_cache.move_to_end(cache_key)
+    return payload
+
 
-@lru_cache(maxsize=1)
-def get_jwks() -> Dict:
+def _cache_payload(cache_key: bytes, payload: Dict) -> None:
+    """
+    Remember a validated token payload.
+
+    Entries live for AUTH_TOKEN_CACHE_TTL seconds, but never past the token's
+    own exp claim. Userinfo-validated (JWE/opaque) payloads have no exp and
+    use the TTL alone.
+
+    Args:
+        cache_key: Key from _token_cache_key()
+        payload: Validated token payload
+    """
+    now = time.time()
+    ttl = settings.TOKEN_CACHE_TTL
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - now)
+
+    if ttl <= 0:
+        return
+
+    _token_cache[cache_key] = (payload, now + ttl)
+    _token_cache.move_to_end(cache_key)
+    if len(_token_cache) > settings.TOKEN_CACHE_MAX_SIZE:
+        _token_cache.popitem(last=False)
+
+
+def _is_rejected(cache_key: bytes) -> bool:
+    """Whether the token was rejected within the last AUTH_NEGATIVE_CACHE_TTL seconds."""
+    expires_at = _rejected_tokens.get(cache_key)
+    if expires_at is None:
+        return False
+
+    if expires_at <= time.time():
+        del _rejected_tokens[cache_key]
+        return False
+
+    return True
+
+
+def _remember_rejected(cache_key: bytes) -> None:
+    """Negatively cache a rejected token for AUTH_NEGATIVE_CACHE_TTL seconds."""
+    _rejected_tokens[cache_key] = time.time() + settings.NEGATIVE_CACHE_TTL
+    _rejected_tokens.move_to_end(cache_key)
+    if len(_rejected_tokens) > settings.TOKEN_CACHE_MAX_SIZE:
+        _rejected_tokens.popitem(last=False)
+
+
+async def get_jwks(force_refresh: bool = False) -> Dict:
     """
     Fetch JSON Web Key Set from Auth0.
-    Cached to avoid repeated requests.
+
+    Cached for AUTH_JWKS_CACHE_TTL seconds; concurrent callers share one fetch.
+    With the background refresher running (start_jwks_refresh), requests
+    normally never wait for a fetch.
+
+    Args:
+        force_refresh: Re-fetch even if the cache is fresh (used when a token's
+            kid is unknown - Auth0 may have rotated its signing keys). Ignored
+            if the JWKS was fetched less than JWKS_MIN_REFRESH_INTERVAL ago.
+
+    Returns:
+        JWKS dict
+
+    Raises:
+        HTTPException: If the JWKS can't be fetched and nothing is cached
+    """
+    if _jwks is not None and not force_refresh and not _jwks_expired():
+        return _jwks
+
+    async with _jwks_lock:
+        age = time.time() - _jwks_fetched_at
+        if _jwks is None or _jwks_expired() or (force_refresh and age >= JWKS_MIN_REFRESH_INTERVAL):
+            try:
+                await _refresh_jwks()
+            except HTTPException:
+                if _jwks is None:
+                    raise
+                logger.warning("JWKS refresh failed - continuing with cached keys")
+    return _jwks
+
+
+def _jwks_expired() -> bool:
+    """Whether the cached JWKS is older than AUTH_JWKS_CACHE_TTL."""
+    return time.time() - _jwks_fetched_at >= settings.JWKS_CACHE_TTL
+
+
+async def _refresh_jwks() -> None:
+    """Fetch the JWKS and replace the cached copy and its kid index."""
+    global _jwks, _keys_by_kid, _jwks_fetched_at
+
+    jwks = await _fetch_jwks()
+
+    keys_by_kid = {}
+    for key in jwks.get("keys", []):
+        if key.get("kty") != "RSA" or "kid" not in key:
+            continue
+        try:
+            keys_by_kid[key["kid"]] = RSAAlgorithm.from_jwk(key)
+        except jwt.InvalidKeyError as e:
+            logger.warning(f"Skipping invalid JWKS key {key['kid']}: {e}")
+
+    _keys_by_kid = keys_by_kid
+    _jwks = jwks
+    _jwks_fetched_at = time.time()
+
+
+async def _refresh_jwks_periodically() -> None:
+    """Background task: re-fetch the JWKS shortly before each expiry."""
+    interval = max(settings.JWKS_CACHE_TTL - JWKS_REFRESH_AHEAD, JWKS_MIN_REFRESH_INTERVAL)
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with _jwks_lock:
+                await _refresh_jwks()
+        except HTTPException:
+            # Already logged by _fetch_jwks; requests keep using the cached keys
+            pass
+
+
+async def prefetch_jwks() -> None:
     """
-    jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-    logger.info(f"Fetching JWKS from Auth0: {jwks_url}")
+    Fetch the JWKS before the server accepts requests (called on server startup).
+
+    A failure is logged, not raised - the server still starts and get_jwks()
+    fetches lazily on the first authenticated request.
+    """
+    try:
+        jwks = await get_jwks()
+    except HTTPException:
+        logger.warning("JWKS prefetch failed - will fetch on first authenticated request")
+        return
+
+    logger.info(f"JWKS prefetched - key IDs: {[k.get('kid') for k in jwks.get('keys', [])]}")
+
+
+def start_jwks_refresh() -> None:
+    """Start the background JWKS refresher (called on server startup, after prefetch_jwks)."""
+    global _jwks_refresh_task
+
+    if _jwks_refresh_task is None:
+        _jwks_refresh_task = asyncio.create_task(_refresh_jwks_periodically())
+
+
+async def stop_jwks_refresh() -> None:
+    """Stop the background JWKS refresher (called on server shutdown)."""
+    global _jwks_refresh_task
+
+    if _jwks_refresh_task is not None:
+        _jwks_refresh_task.cancel()
+        try:
+            await _jwks_refresh_task
+        except asyncio.CancelledError:
+            pass
+        _jwks_refresh_task = None
+
+
+async def _fetch_jwks() -> Dict:
+    """Download the JWKS from Auth0."""
+    logger.info(f"Fetching JWKS from Auth0: {_JWKS_URL}")
 
     try:
-        response = httpx.get(jwks_url, timeout=10.0)
+        response = await _http_client.get(_JWKS_URL)
         response.raise_for_status()
-        jwks = response.json()
+        jwks = orjson.loads(response.content)
 
         key_count = len(jwks.get("keys", []))
         logger.info(f"Successfully fetched JWKS with {key_count} keys")
@@ -94,14 +374,14 @@ def get_jwks() -> Dict:
 
         return jwks
     except Exception as e:
-        logger.error(f"Failed to fetch JWKS from {jwks_url}: {str(e)}")
+        logger.error(f"Failed to fetch JWKS from {_JWKS_URL}: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch JWKS: {str(e)}"
         )
 
 
-def validate_via_userinfo(token: str) -> Dict:
+async def validate_via_userinfo(token: str) -> Dict:
     """
     Validate opaque/JWE token using Auth0 userinfo endpoint.
 
@@ -117,25 +397,20 @@ def validate_via_userinfo(token: str) -> Dict:
     Raises:
         HTTPException: If token is invalid
     """
-    userinfo_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-    logger.info(f"Validating token via userinfo: {userinfo_url}")
+    logger.info(f"Validating token via userinfo: {_USERINFO_URL}")
 
     try:
-        response = httpx.get(
-            userinfo_url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=10.0
+        response = await _http_client.get(
+            _USERINFO_URL,
+            headers={"Authorization": f"Bearer {token}"}
         )
 
         if response.status_code == 401:
             logger.error("Token validation failed: 401 Unauthorized from userinfo endpoint")
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid or expired token"
-            )
+            raise TokenRejected("Invalid or expired token")
 
         response.raise_for_status()
-        userinfo = response.json()
+        userinfo = orjson.loads(response.content)
 
         logger.info(f"Token validated successfully via userinfo for subject: {userinfo.get('sub')}")
 
@@ -143,12 +418,14 @@ def validate_via_userinfo(token: str) -> Dict:
         # Auth0 userinfo doesn't return scopes, so we grant all configured scopes
         return {
             "sub": userinfo.get("sub"),
-            "iss": settings.AUTH0_ISSUER.rstrip('/'),
-            "aud": settings.AUTH0_API_AUDIENCE,
+            "iss": _USERINFO_ISSUER,
+            "aud": _AUDIENCE,
             "scope": "federalrunner:read federalrunner:execute",  # Grant all scopes for validated tokens
             "permissions": ["federalrunner:read", "federalrunner:execute"]
         }
 
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         logger.error(f"Token validation failed: HTTP {e.response.status_code}")
         raise HTTPException(
@@ -171,6 +448,10 @@ async def verify_token_manual(request) -> Dict:
     conditionally validate tokens based on MCP method type (from request body).
     Does not use FastAPI's dependency injection to allow conditional execution.
 
+    Successfully validated tokens are cached (see _cache_payload), so repeated
+    calls with the same bearer token skip signature verification and the
+    userinfo round trip.
+
     Args:
         request: FastAPI Request object
 
@@ -180,8 +461,6 @@ async def verify_token_manual(request) -> Dict:
     Raises:
         HTTPException: If token is missing, invalid, or expired
     """
-    from fastapi import Request
-
     # Extract Authorization header
     auth_header = request.headers.get("Authorization")
     if not auth_header:
@@ -192,8 +471,9 @@ async def verify_token_manual(request) -> Dict:
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    # Validate Bearer scheme
-    if not auth_header.startswith("Bearer "):
+    # Validate Bearer scheme and extract token
+    match = _BEARER_RE.match(auth_header)
+    if match is None:
         logger.error(f"Invalid Authorization header format: {auth_header[:20]}...")
         raise HTTPException(
             status_code=401,
@@ -201,82 +481,138 @@ async def verify_token_manual(request) -> Dict:
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    # Extract token
-    token = auth_header[7:]  # Remove "Bearer " prefix
+    token = match.group(1)
+    if not MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH:
+        logger.error(f"Rejected bearer token with implausible length: {len(token)}")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid token length",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    # Fast path: token already validated - nothing else is built or formatted
+    cache_key = _token_cache_key(token)
+    payload = _get_cached_payload(cache_key)
+    if payload is not None:
+        logger.debug("Token validated from cache")
+        return payload
+
     token_preview = f"{token[:20]}...{token[-20:]}" if len(token) > 40 else token
 
+    if _is_rejected(cache_key):
+        logger.warning(f"Token rejected from negative cache: {token_preview}")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or expired token"
+        )
+
     logger.info(f"Validating token: {token_preview}")
 
     try:
-        # Try to decode token header
-        try:
-            unverified_header = jwt.get_unverified_header(token)
-            token_kid = unverified_header.get("kid")
-            logger.debug(f"Token key ID (kid): {token_kid}")
-
-            # If no kid, this is likely a JWE or opaque token
-            if token_kid is None:
-                logger.info("Token has no kid - using Auth0 userinfo for validation")
-                return validate_via_userinfo(token)
-
-        except JWTError as e:
-            # Not a JWT, try userinfo validation
-            logger.info(f"Token is not a JWT: {e} - using Auth0 userinfo for validation")
-            return validate_via_userinfo(token)
-
-        # Get JWKS from Auth0
-        jwks = get_jwks()
-
-        # Find matching key in JWKS
-        rsa_key = None
-        for key in jwks.get("keys", []):
-            if key["kid"] == token_kid:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"]
-                }
-                logger.debug(f"Found matching key in JWKS: {token_kid}")
-                break
+        payload = await _validate_token(token, token_preview)
+    except TokenRejected:
+        _remember_rejected(cache_key)
+        raise
+
+    _cache_payload(cache_key, payload)
+    return payload
+
+
+def _peek_kid(token: str) -> Optional[str]:
+    """
+    Read the key ID from a token's header without verifying anything.
+
+    A plain base64url + JSON decode of the first segment - cheaper than a
+    full JWT header parse, and opaque tokens fall out as None instead of
+    raising a decode error on every request.
+
+    Args:
+        token: Access token
+
+    Returns:
+        The header's kid, or None if the token isn't a JWT or has no kid
+    """
+    if "." not in token:
+        return None
+
+    try:
+        header_b64 = token.split(".", 1)[0]
+        header = orjson.loads(base64.urlsafe_b64decode(header_b64 + "=" * (-len(header_b64) % 4)))
+        kid = header.get("kid")
+    except (ValueError, AttributeError):
+        return None
+
+    return kid if isinstance(kid, str) else None
+
+
+async def _validate_token(token: str, token_preview: str) -> Dict:
+    """
+    Validate a bearer token against Auth0 (JWKS for JWTs, userinfo otherwise).
+
+    Args:
+        token: Access token to validate
+        token_preview: Shortened token for log messages
+
+    Returns:
+        Decoded token payload with scopes
+
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    try:
+        # Read the kid from the token header (None for JWE/opaque tokens)
+        token_kid = _peek_kid(token)
+        logger.debug(f"Token key ID (kid): {token_kid}")
+
+        if token_kid is None:
+            logger.info("Token has no kid (JWE/opaque) - using Auth0 userinfo for validation")
+            return await validate_via_userinfo(token)
+
+        # Get JWKS from Auth0 and find the matching key
+        await get_jwks()
+        rsa_key = _keys_by_kid.get(token_kid)
+
+        if rsa_key is None:
+            # Unknown kid - Auth0 may have rotated its signing keys; refresh once and retry
+            logger.info(f"Token key ID {token_kid} not in cached JWKS - refreshing JWKS")
+            await get_jwks(force_refresh=True)
+            rsa_key = _keys_by_kid.get(token_kid)
 
         if rsa_key is None:
             logger.error(f"Token key ID {token_kid} not found in JWKS")
-            logger.debug(f"Available key IDs: {[k.get('kid') for k in jwks.get('keys', [])]}")
-            raise HTTPException(
-                status_code=401,
-                detail="Unable to find appropriate key in JWKS"
-            )
+            logger.debug(f"Available key IDs: {list(_keys_by_kid)}")
+            raise TokenRejected("Unable to find appropriate key in JWKS")
+
+        logger.debug(f"Found matching key in JWKS: {token_kid}")
 
         # Verify and decode token
         logger.debug(f"Verifying token signature and claims")
-        logger.debug(f"Expected audience: {settings.AUTH0_API_AUDIENCE}")
-        logger.debug(f"Expected issuer: {settings.AUTH0_ISSUER}")
+        logger.debug(f"Expected audience: {_AUDIENCE}")
+        logger.debug(f"Expected issuer: {_ISSUER}")
 
-        payload = jwt.decode(
+        # RS256 verification is CPU-bound - run it in a worker thread so the
+        # event loop keeps serving other requests meanwhile
+        payload = await asyncio.to_thread(
+            jwt.decode,
             token,
             rsa_key,
             algorithms=["RS256"],
-            audience=settings.AUTH0_API_AUDIENCE,
-            issuer=settings.AUTH0_ISSUER
+            audience=_AUDIENCE,
+            issuer=_ISSUER
         )
 
         # Log successful validation (don't log sensitive payload data)
         scopes = get_token_scopes(payload)
         subject = payload.get("sub", "unknown")
         logger.info(f"Token validated successfully for subject: {subject}")
-        logger.info(f"Token scopes: {scopes}")
+        logger.info(f"Token scopes: {sorted(scopes)}")
 
         return payload
 
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         logger.error(f"JWT validation failed: {str(e)}")
         logger.debug(f"Token preview: {token_preview}")
-        raise HTTPException(
-            status_code=401,
-            detail=f"Token validation failed: {str(e)}"
-        )
+        raise TokenRejected(f"Token validation failed: {str(e)}")
     except HTTPException:
         # Re-raise HTTPExceptions as-is
         raise
@@ -288,22 +624,28 @@ async def verify_token_manual(request) -> Dict:
         )
 
 
-def get_token_scopes(token_payload: Dict) -> list:
+def get_token_scopes(token_payload: Dict) -> FrozenSet[str]:
     """
     Extract scopes from decoded token payload.
 
+    The result is stored on the payload under '_scopes', so a cached token's
+    scope string is only split once.
+
     Args:
         token_payload: Decoded JWT token
 
     Returns:
-        List of scope strings (e.g., ["federalrunner:read", "federalrunner:execute"])
+        Set of scope strings (e.g., {"federalrunner:read", "federalrunner:execute"})
     """
-    # Auth0 stores scopes as space-separated string
-    scopes_string = token_payload.get("scope", "")
-    return scopes_string.split() if scopes_string else []
+    scopes = token_payload.get("_scopes")
+    if scopes is None:
+        # Auth0 stores scopes as space-separated string
+        scopes = frozenset(token_payload.get("scope", "").split())
+        token_payload["_scopes"] = scopes
+    return scopes
 
 
-def require_scope(required_scope: str, token_scopes: list) -> None:
+def require_scope(required_scope: str, token_scopes: FrozenSet[str]) -> None:
     """
     Verify that token has required scope.
 
@@ -318,7 +660,7 @@ def require_scope(required_scope: str, token_scopes: list) -> None:
     logger.debug(f"Token has scopes: {token_scopes}")
 
     if required_scope not in token_scopes:
-        logger.warning(f"Insufficient permissions: required '{required_scope}', have {token_scopes}")
+        logger.warning(f"Insufficient permissions: required '{required_scope}', have {sorted(token_scopes)}")
         raise HTTPException(
             status_code=403,
             detail=f"Insufficient permissions. Required scope: {required_scope}"
@@ -63,6 +63,11 @@ class FederalRunnerConfig(BaseSettings):
         description="Slow down browser actions by N milliseconds (for debugging)"
     )
 
+    cache_static_assets: bool = Field(
+        default=True,
+        description="Serve the wizard site's static assets (JS, CSS, images, fonts) from an in-process cache across executions"
+    )
+
     # Execution Settings
     execution_timeout: int = Field(
         default=240,  # 4 minutes - must be > navigation_timeout (180s)
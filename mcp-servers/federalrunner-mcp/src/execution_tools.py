@@ -10,19 +10,101 @@ These tools implement the schema-first pattern where Claude:
 NO field_mapper.py needed - Claude does the mapping naturally!
 """
 
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+import asyncio
 import json
 from pathlib import Path
 
 from .config import get_config, FederalRunnerConfig
 from .models import WizardStructure
 from .schema_validator import SchemaValidator
-from .playwright_client import PlaywrightClient
+
+if TYPE_CHECKING:
+    # Imported lazily at execution time: Playwright is only needed to execute,
+    # so list_wizards/get_wizard_info (and server cold start) skip loading it
+    from .playwright_client import PlaywrightClient
 
 import logging
 logger = logging.getLogger(__name__)
 
 
+# Parsed wizard structures keyed by path, with the file mtime they were parsed at
+_wizard_cache: Dict[Path, Tuple[int, WizardStructure]] = {}
+
+
+def _load_wizard(wizard_path: Path) -> WizardStructure:
+    """
+    Load a wizard structure, reusing the parsed model while the file is unchanged.
+
+    Every tool call re-reads the same wizard JSON; a long-lived server only
+    needs to re-parse when FederalScout rewrites the file (mtime changes).
+
+    Args:
+        wizard_path: Path to the wizard structure JSON file
+
+    Returns:
+        WizardStructure instance (shared between calls - do not modify)
+    """
+    mtime = wizard_path.stat().st_mtime_ns
+    cached = _wizard_cache.get(wizard_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    wizard = WizardStructure.from_json_file(wizard_path)
+    _wizard_cache[wizard_path] = (mtime, wizard)
+    return wizard
+
+
+# Shared browser process reused by every execution (each execution gets its own context).
+# Holds the PlaywrightClient that launched it so its (playwright, browser) pair can be shut down.
+_BROWSER_SINGLETON: Optional["PlaywrightClient"] = None
+_browser_lock = asyncio.Lock()
+
+
+async def _get_shared_browser(config: FederalRunnerConfig):
+    """
+    Get the process-wide browser, launching it on first use.
+
+    Executions then only pay for a new BrowserContext instead of starting
+    Playwright and launching a browser every time. Relaunches if the
+    browser has disconnected (e.g. crashed).
+
+    Args:
+        config: FederalRunner configuration with browser settings
+
+    Returns:
+        Launched Browser instance
+    """
+    from .playwright_client import PlaywrightClient
+
+    global _BROWSER_SINGLETON
+    async with _browser_lock:
+        if _BROWSER_SINGLETON is None or not _BROWSER_SINGLETON.browser.is_connected():
+            launcher = PlaywrightClient(config)
+            try:
+                await launcher.launch()
+            except Exception:
+                await launcher.close()
+                raise
+            _BROWSER_SINGLETON = launcher
+            logger.info("   Shared browser launched for wizard executions")
+    return _BROWSER_SINGLETON.browser
+
+
+async def shutdown_browser():
+    """
+    Close the shared browser, if one was launched.
+
+    Called from the server's shutdown path so no browser process is left
+    behind when FederalRunner exits.
+    """
+    global _BROWSER_SINGLETON
+    if _BROWSER_SINGLETON is not None:
+        launcher, _BROWSER_SINGLETON = _BROWSER_SINGLETON, None
+        await launcher.close()
+        logger.info("Shared browser shut down")
+
+
 async def federalrunner_list_wizards() -> Dict[str, Any]:
     """
     List all available wizards.
@@ -65,7 +147,7 @@ async def federalrunner_list_wizards() -> Dict[str, Any]:
         wizards = []
         for json_file in wizard_dir.glob("*.json"):
             try:
-                wizard = WizardStructure.from_json_file(json_file)
+                wizard = _load_wizard(json_file)
                 wizards.append({
                     'wizard_id': wizard.wizard_id,
                     'name': wizard.name,
@@ -152,7 +234,7 @@ async def federalrunner_get_wizard_info(wizard_id: str) -> Dict[str, Any]:
                 'hint': 'Call federalrunner_list_wizards() to see available wizards'
             }
 
-        wizard = WizardStructure.from_json_file(wizard_path)
+        wizard = _load_wizard(wizard_path)
         logger.info(f"   [OK] Wizard loaded: {wizard.name} ({wizard.total_pages} pages)")
 
         # 2. Load User Data Schema (THE CONTRACT)
@@ -287,7 +369,7 @@ async def federalrunner_execute_wizard(
                 'error': f'Wizard structure not found: {wizard_id}'
             }
 
-        wizard = WizardStructure.from_json_file(wizard_path)
+        wizard = _load_wizard(wizard_path)
         logger.info(f"   [OK] Wizard loaded: {wizard.name} ({wizard.total_pages} pages)")
 
         # 4.  MAP user_data (field_id) -> field_values (selector)
@@ -311,7 +393,9 @@ async def federalrunner_execute_wizard(
         logger.info(" Step 5: Executing wizard with Playwright...")
         logger.info(f"   Browser: {config.browser_type}, Headless: {config.headless}, Slow Mo: {config.slow_mo}ms")
 
-        client = PlaywrightClient(config)
+        from .playwright_client import PlaywrightClient
+
+        client = PlaywrightClient(config, browser=await _get_shared_browser(config))
         result = await client.execute_wizard_atomically(wizard, field_values)
 
         if result['success']:
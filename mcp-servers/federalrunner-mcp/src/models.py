@@ -314,10 +314,8 @@ class WizardStructure(BaseModel):
         Returns:
             WizardStructure instance
         """
-        with open(filepath, 'r') as f:
-            data = f.read()
-
-        return cls.model_validate_json(data)
+        # Bytes go straight to pydantic-core's JSON parser (no str decode)
+        return cls.model_validate_json(filepath.read_bytes())
 
     def get_all_required_fields(self) -> List[FieldStructure]:
         """
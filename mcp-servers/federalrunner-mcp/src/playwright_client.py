@@ -7,7 +7,8 @@ This module implements the execution engine that takes pre-mapped field values
 Key Design:
 - Receives field_values dict with SELECTORS as keys (not field_ids)
 - Mapping from field_id -> selector happens in execution_tools.py
-- Each execution is atomic: launch -> fill all pages -> extract -> close
+- Each execution is atomic: new context -> fill all pages -> extract -> close
+  (the browser process itself can be shared - see execution_tools._get_shared_browser)
 - Supports both Chromium (non-headless, debugging) and WebKit (headless, production)
 
 Critical Patterns from FederalScout Discovery:
@@ -17,10 +18,12 @@ Critical Patterns from FederalScout Discovery:
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional, Any, Tuple
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright, Route
 import base64
 import logging
+import re
 import time
 import asyncio
 
@@ -38,6 +41,100 @@ from .config import FederalRunnerConfig
 
 logger = logging.getLogger(__name__)
 
+# JavaScript click for hidden elements - selector is passed as an argument, not
+# interpolated, so the script text stays constant and quotes in selectors are safe
+_CLICK_BY_SELECTOR_JS = "(selector) => document.querySelector(selector).click()"
+
+# Static assets (scripts, styles, images, fonts) served from _static_asset_cache.
+# Matched against the URL path only, so query strings can't make a page look like an asset
+_STATIC_ASSET_PATH = re.compile(r"\.(?:js|css|png|jpe?g|gif|svg|ico|woff2?|ttf)$", re.IGNORECASE)
+STATIC_ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Lifetime for cached assets whose response has no Cache-Control max-age
+STATIC_ASSET_CACHE_DEFAULT_TTL_S = 600
+
+_CACHE_CONTROL_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+_CACHE_CONTROL_NO_STORE = re.compile(r"(?:^|,)\s*(?:no-store|no-cache|private)\b", re.IGNORECASE)
+
+# url -> (expires_at monotonic, status, headers, body), shared by every execution in this process
+_static_asset_cache: Dict[str, Tuple[float, int, Dict[str, str], bytes]] = {}
+_static_asset_cache_bytes = 0
+
+
+def _encode_screenshots(screenshots: List[bytes]) -> List[str]:
+    """
+    Base64-encode the screenshots that go into the response.
+
+    Screenshots are kept as raw JPEG bytes during execution and only the
+    ones actually returned (the last 2 in headless mode) are encoded.
+    Failed captures (b"") encode to "".
+    """
+    return [base64.b64encode(screenshot).decode('ascii') for screenshot in screenshots]
+
+
+def _is_static_asset(url: str) -> bool:
+    """Route predicate: True if the URL path ends in a static asset extension."""
+    return _STATIC_ASSET_PATH.search(urlsplit(url).path) is not None
+
+
+def _cache_ttl(headers: Dict[str, str]) -> Optional[int]:
+    """
+    Seconds a response may be served from _static_asset_cache, or None if not cacheable.
+
+    Honors Cache-Control: no-store/no-cache/private are never cached,
+    max-age sets the lifetime, otherwise STATIC_ASSET_CACHE_DEFAULT_TTL_S.
+    """
+    cache_control = headers.get('cache-control', '')
+    if _CACHE_CONTROL_NO_STORE.search(cache_control):
+        return None
+    max_age = _CACHE_CONTROL_MAX_AGE.search(cache_control)
+    ttl = int(max_age.group(1)) if max_age else STATIC_ASSET_CACHE_DEFAULT_TTL_S
+    return ttl or None
+
+
+async def _serve_static_asset(route: Route):
+    """
+    Route handler that answers static asset GETs from _static_asset_cache.
+
+    Every execution opens a fresh BrowserContext, so without this the wizard
+    site's JS/CSS bundles would be downloaded again on every run. Misses are
+    fetched normally and cached if the response was a cacheable 200 (see
+    _cache_ttl); entries expire so redeployed assets are picked up. If the
+    fetch itself fails, the request is handed back to the browser unchanged.
+    """
+    global _static_asset_cache_bytes
+    request = route.request
+    if request.method != 'GET':
+        await route.continue_()
+        return
+
+    cached = _static_asset_cache.get(request.url)
+    if cached is not None:
+        expires_at, status, headers, body = cached
+        if time.monotonic() < expires_at:
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+        del _static_asset_cache[request.url]
+        _static_asset_cache_bytes -= len(body)
+
+    try:
+        response = await route.fetch()
+        body = await response.body()
+    except Exception as e:
+        logger.debug(f"  Static asset fetch failed, continuing uncached: {request.url} ({e})")
+        await route.continue_()
+        return
+
+    ttl = _cache_ttl(response.headers) if response.status == 200 else None
+    if ttl and _static_asset_cache_bytes + len(body) <= STATIC_ASSET_CACHE_MAX_BYTES:
+        # body is already decoded - drop encoding/length headers that described the wire format
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ('content-encoding', 'content-length')
+        }
+        _static_asset_cache[request.url] = (time.monotonic() + ttl, response.status, headers, body)
+        _static_asset_cache_bytes += len(body)
+    await route.fulfill(response=response, body=body)
+
 
 class PlaywrightClient:
     """
@@ -52,18 +149,22 @@ class PlaywrightClient:
     No persistent sessions - designed for Cloud Run stateless execution.
     """
 
-    def __init__(self, config: FederalRunnerConfig):
+    def __init__(self, config: FederalRunnerConfig, browser: Optional[Browser] = None):
         """
         Initialize Playwright client with configuration.
 
         Args:
             config: FederalRunnerConfig with browser and execution settings
+            browser: Optional already-running browser to execute in. Each
+                execution still gets its own fresh BrowserContext, and only
+                that context is closed afterwards - the browser stays up.
         """
         self.config = config
         self.playwright: Optional[Playwright] = None
-        self.browser: Optional[Browser] = None
+        self.browser: Optional[Browser] = browser
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._owns_browser = browser is None
 
     async def execute_wizard_atomically(
         self,
@@ -112,6 +213,7 @@ class PlaywrightClient:
             max_retries = 9  # 10 total attempts (initial + 9 retries)
             retry_delay = 2000  # 2 seconds between retries
             navigation_timeout_per_attempt = 10000  # 10 seconds per attempt
+            entry_timeout = 30000  # 30 seconds for the landing page to render its entry element
 
             for attempt in range(max_retries + 1):
                 try:
@@ -119,10 +221,11 @@ class PlaywrightClient:
                         logger.warning(f"   Retry attempt {attempt}/{max_retries} after {retry_delay/1000}s delay...")
                         await self.page.wait_for_timeout(retry_delay)
 
+                    # Only the goto is retried; readiness is checked once below
                     await self.page.goto(
                         wizard_structure.url,
-                        wait_until='networkidle',
-                        timeout=navigation_timeout_per_attempt  # 20s per attempt
+                        wait_until='domcontentloaded',
+                        timeout=navigation_timeout_per_attempt
                     )
                     logger.info(f"   Navigation successful (attempt {attempt + 1}/{max_retries + 1})")
                     break  # Success - exit retry loop
@@ -137,19 +240,32 @@ class PlaywrightClient:
                         logger.warning(f"   Navigation timeout on attempt {attempt + 1}/{max_retries + 1}, will retry...")
                         continue
 
-            await self.page.wait_for_timeout(1000)  # Let page settle
+            # Ready once the start button (or first field) renders - not on network
+            # idle, which analytics beacons on these sites can hold off for seconds.
+            # Outside the retry loop: a wrong/stale selector fails once, not 10 times
+            try:
+                await self._wait_for_wizard_entry(wizard_structure, timeout=entry_timeout)
+            except Exception as entry_error:
+                entry = wizard_structure.start_action.selector if wizard_structure.start_action else "first page"
+                raise ValueError(
+                    f"Wizard landing page did not become ready within {entry_timeout / 1000:.0f}s "
+                    f"(waiting for: {entry}). The page may not have loaded, or the wizard "
+                    f"structure's selector may be stale. Error: {entry_error}"
+                )
+
             screenshots.append(await self._take_screenshot("initial_page"))
 
             # 3. Execute start action (if exists)
             if wizard_structure.start_action:
                 logger.info(f"->  Executing start action: {wizard_structure.start_action.selector}")
                 await self._execute_start_action(wizard_structure.start_action)
-                await self.page.wait_for_load_state('networkidle')
+                await self._wait_for_page_ready(wizard_structure.pages[0] if wizard_structure.pages else None)
                 await self.page.wait_for_timeout(1000)
                 screenshots.append(await self._take_screenshot("after_start_action"))
 
             # 4. Fill all pages sequentially
-            for page_structure in wizard_structure.pages:
+            wizard_pages = wizard_structure.pages
+            for page_index, page_structure in enumerate(wizard_pages):
                 logger.info(f"=-> Page {page_structure.page_number}/{wizard_structure.total_pages}: {page_structure.page_title}")
 
                 # Fill all fields on this page
@@ -167,9 +283,10 @@ class PlaywrightClient:
                         )
 
                     # Fill field if value provided
+                    # No fixed pause between fields: each interaction waits for its
+                    # element, so conditional fields revealed by the previous answer are awaited
                     if field_value is not None:
                         await self._fill_field(field, field_value)
-                        await self.page.wait_for_timeout(300)  # Brief pause between fields
 
                 # Take screenshot after filling page
                 screenshot_label = f"page_{page_structure.page_number}_filled"
@@ -178,8 +295,9 @@ class PlaywrightClient:
                 # Click continue button to go to next page
                 logger.info(f"->  Clicking continue button")
                 await self._click_continue(page_structure.continue_button)
-                await self.page.wait_for_load_state('networkidle')
-                await self.page.wait_for_timeout(1500)  # Wait for next page to load
+                next_page = wizard_pages[page_index + 1] if page_index + 1 < len(wizard_pages) else None
+                await self._wait_for_page_ready(next_page)
+                await self.page.wait_for_timeout(1500)  # Let next page finish rendering
 
                 pages_completed += 1
 
@@ -208,7 +326,7 @@ class PlaywrightClient:
                 'success': True,
                 'wizard_id': wizard_structure.wizard_id,
                 'results': results,
-                'screenshots': response_screenshots,
+                'screenshots': _encode_screenshots(response_screenshots),
                 'pages_completed': pages_completed,
                 'execution_time_ms': execution_time_ms,
                 'timestamp': time.time()
@@ -242,7 +360,7 @@ class PlaywrightClient:
                 'success': False,
                 'error': str(e),
                 'error_type': type(e).__name__,
-                'screenshots': response_screenshots,
+                'screenshots': _encode_screenshots(response_screenshots),
                 'pages_completed': pages_completed,
                 'execution_time_ms': execution_time_ms,
                 'timestamp': time.time()
@@ -252,13 +370,16 @@ class PlaywrightClient:
             # ALWAYS close browser (atomic execution requirement)
             await self._close_browser()
 
-    async def _launch_browser(self):
+    async def launch(self) -> Browser:
         """
-        Launch browser with configured settings.
+        Start Playwright and launch the configured browser (no context or page).
 
         Browser selection:
         - Chromium: Local development (non-headless, visible)
         - WebKit: Production (headless, FSA-compatible)
+
+        Returns:
+            Launched Browser instance
         """
         self.playwright = await async_playwright().start()
 
@@ -279,6 +400,19 @@ class PlaywrightClient:
             slow_mo=self.config.slow_mo
         )
 
+        logger.info(
+            f" Browser launched: {self.config.browser_type} "
+            f"(headless={self.config.headless})"
+        )
+        return self.browser
+
+    async def _launch_browser(self):
+        """
+        Open a fresh context and page, launching the browser first unless one was injected.
+        """
+        if self._owns_browser:
+            await self.launch()
+
         # Create context with viewport settings
         self.context = await self.browser.new_context(
             viewport={
@@ -288,6 +422,9 @@ class PlaywrightClient:
             user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         )
 
+        if self.config.cache_static_assets:
+            await self.context.route(_is_static_asset, _serve_static_asset)
+
         # Create page
         self.page = await self.context.new_page()
 
@@ -297,7 +434,7 @@ class PlaywrightClient:
         logger.debug(f"Set page default timeout to {self.config.navigation_timeout}ms")
 
         logger.info(
-            f" Browser launched: {self.config.browser_type} "
+            f" Browser context ready: {self.config.browser_type} "
             f"(headless={self.config.headless}, viewport={self.config.viewport_width}x{self.config.viewport_height})"
         )
 
@@ -340,7 +477,9 @@ class PlaywrightClient:
                         raise ValueError(f"Repeatable field '{field.field_id}' is missing add_button_selector")
 
                     await self.page.click(add_button_selector)
-                    await self.page.wait_for_timeout(500)  # Wait for form to appear
+                    # Wait for the item form to appear (returns as soon as it's visible)
+                    if field.sub_fields:
+                        await self.page.wait_for_selector(field.sub_fields[0].selector, state='visible', timeout=5000)
 
                     # Fill each sub-field with the corresponding value from item_data
                     for sub_field in field.sub_fields:
@@ -359,11 +498,14 @@ class PlaywrightClient:
                             # Use the same Unicode handling strategy as main SELECT
                             # OPTIMIZED: 5-second timeout per strategy (fast failure)
                             value_str = str(sub_field_value)
+                            unicode_str = value_str.replace("'", "\u2019")
                             try:
                                 await self.page.select_option(sub_field.selector, value_str, timeout=5000)
                             except Exception:
+                                if unicode_str == value_str:
+                                    raise
                                 # Try Unicode apostrophe version
-                                await self.page.select_option(sub_field.selector, value_str.replace("'", "\u2019"), timeout=5000)
+                                await self.page.select_option(sub_field.selector, unicode_str, timeout=5000)
                         else:
                             logger.warning(f"          Unsupported interaction type for sub_field: {sub_field.interaction}")
 
@@ -402,7 +544,10 @@ class PlaywrightClient:
 
             elif field.interaction == InteractionType.JAVASCRIPT_CLICK:
                 # JavaScript click for hidden elements (FSA radio buttons)
-                await self.page.evaluate(f"document.querySelector('{field.selector}').click()")
+                # evaluate() doesn't auto-wait like fill/click/select_option, so wait for
+                # the element to exist (hidden radios are never 'visible')
+                await self.page.wait_for_selector(field.selector, state='attached')
+                await self.page.evaluate(_CLICK_BY_SELECTOR_JS, field.selector)
                 logger.debug(f"    -> Clicked with JavaScript (hidden element)")
 
             elif field.interaction == InteractionType.SELECT:
@@ -427,13 +572,17 @@ class PlaywrightClient:
                 # 3. Label matching (use label= parameter)
                 # 4. Label matching with Unicode
                 # Each strategy has format: (name, value_arg, label_arg)
-
-                strategies = [
-                    ("original value", value_str, None),
-                    ("unicode apostrophe", value_str.replace("'", "\u2019"), None),
-                    ("label (original)", None, value_str),
-                    ("label (unicode)", None, value_str.replace("'", "\u2019"))
-                ]
+                # Unicode variants are only tried when the value has an apostrophe -
+                # otherwise they are identical retries that each burn a full timeout
+
+                strategies = [("original value", value_str, None)]
+                unicode_str = value_str.replace("'", "\u2019")
+                has_apostrophe = unicode_str != value_str
+                if has_apostrophe:
+                    strategies.append(("unicode apostrophe", unicode_str, None))
+                strategies.append(("label (original)", None, value_str))
+                if has_apostrophe:
+                    strategies.append(("label (unicode)", None, unicode_str))
 
                 for strategy_name, value_arg, label_arg in strategies:
                     try:
@@ -504,9 +653,9 @@ class PlaywrightClient:
                 f"Button may not be visible or selector may be incorrect."
             )
 
-    async def _take_screenshot(self, label: str = "screenshot") -> str:
+    async def _take_screenshot(self, label: str = "screenshot") -> bytes:
         """
-        Take optimized screenshot and return base64-encoded string.
+        Take optimized screenshot and return the raw JPEG bytes.
 
         Optimization strategy:
         - JPEG format (smaller than PNG)
@@ -518,7 +667,8 @@ class PlaywrightClient:
             label: Label for logging purposes
 
         Returns:
-            Base64-encoded JPEG screenshot
+            JPEG screenshot bytes (base64-encoded later, only if returned -
+            see _encode_screenshots)
         """
         try:
             screenshot_bytes = await self.page.screenshot(
@@ -527,7 +677,6 @@ class PlaywrightClient:
                 full_page=False  # Viewport only (faster, smaller)
             )
 
-            screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
             size_kb = len(screenshot_bytes) / 1024
 
             # Save to disk if configured (for local testing/debugging)
@@ -540,18 +689,18 @@ class PlaywrightClient:
                 # Ensure directory exists
                 screenshot_path.parent.mkdir(parents=True, exist_ok=True)
 
-                with open(screenshot_path, 'wb') as f:
-                    f.write(screenshot_bytes)
+                # Write off the event loop so the disk round trip doesn't stall execution
+                await asyncio.to_thread(screenshot_path.write_bytes, screenshot_bytes)
 
                 logger.debug(f"  ->  Screenshot saved: {screenshot_path.name}")
 
             logger.debug(f"  =-> Screenshot captured: {label} ({size_kb:.1f}KB)")
 
-            return screenshot_b64
+            return screenshot_bytes
 
         except Exception as e:
             logger.warning(f"  ->  Screenshot failed for {label}: {e}")
-            return ""  # Return empty string on failure
+            return b""  # Return empty bytes on failure
 
     async def _extract_results(self) -> Dict[str, Any]:
         """
@@ -602,6 +751,53 @@ class PlaywrightClient:
                 'error_details': str(e)
             }
 
+    async def _wait_for_wizard_entry(self, wizard_structure: WizardStructure, timeout: int):
+        """
+        Wait until the wizard's landing page can be used.
+
+        That is when the start action element is visible, or - for wizards
+        without a start action - when the first page is ready.
+
+        Args:
+            wizard_structure: Wizard being executed
+            timeout: Maximum wait in milliseconds
+        """
+        start_action = wizard_structure.start_action
+        if start_action is None:
+            first_page = wizard_structure.pages[0] if wizard_structure.pages else None
+            await self._wait_for_page_ready(first_page, timeout=timeout)
+            return
+
+        if start_action.selector_type == SelectorType.TEXT:
+            locator = self.page.get_by_text(start_action.selector, exact=True)
+        else:
+            selector = start_action.selector
+            if start_action.selector_type == SelectorType.ID and not selector.startswith('#'):
+                selector = f'#{selector}'
+            locator = self.page.locator(selector)
+
+        await locator.first.wait_for(state='visible', timeout=timeout)
+
+    async def _wait_for_page_ready(self, page_structure: Optional[PageStructure], timeout: Optional[int] = None):
+        """
+        Wait until a wizard page has rendered.
+
+        Waits for the page's first field to be attached (FSA radio buttons are
+        hidden, so 'visible' would never resolve). Falls back to network idle
+        when there is no field to wait for, e.g. the results page after the
+        last continue.
+
+        Args:
+            page_structure: Page expected next, or None for the results page
+            timeout: Maximum wait in milliseconds (page default if None)
+        """
+        if page_structure is not None and page_structure.fields:
+            selector = page_structure.fields[0].selector
+            await self.page.wait_for_selector(selector, state='attached', timeout=timeout)
+            logger.debug(f"  ->  Page {page_structure.page_number} ready ({selector})")
+        else:
+            await self.page.wait_for_load_state('networkidle', timeout=timeout)
+
     async def _execute_start_action(self, start_action: StartAction):
         """
         Execute the start action to begin wizard.
@@ -632,14 +828,27 @@ class PlaywrightClient:
                 f"Start button may not be visible or selector may be incorrect."
             )
 
+    async def close(self):
+        """
+        Close the browser and Playwright instance this client launched.
+        """
+        await self._close_browser()
+
     async def _close_browser(self):
         """
         Close browser and clean up resources.
 
+        With an injected (shared) browser only this execution's context is
+        closed; the browser itself is left running for the next execution.
+
         CRITICAL: Always called in finally block to ensure cleanup.
         """
         try:
-            if self.browser:
+            if not self._owns_browser:
+                if self.context:
+                    await self.context.close()
+                    logger.info("=K Browser context closed")
+            elif self.browser:
                 await self.browser.close()
                 logger.info("=K Browser closed")
 
@@ -650,7 +859,8 @@ class PlaywrightClient:
             logger.warning(f"Error closing browser: {e}")
 
         finally:
-            self.browser = None
+            if self._owns_browser:
+                self.browser = None
             self.context = None
             self.page = None
             self.playwright = None
@@ -15,6 +15,7 @@ by reading the schema and collecting data in the correct format.
 from pathlib import Path
 from typing import Dict, Any, List
 import json
+import orjson
 from jsonschema import validate, ValidationError, Draft7Validator
 
 from .config import FederalRunnerConfig
@@ -70,8 +71,8 @@ class SchemaValidator:
             )
 
         try:
-            with open(schema_path, 'r') as f:
-                schema = json.load(f)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            schema = orjson.loads(schema_path.read_bytes())
 
             logger.info(f"[OK] Schema loaded: {schema_path}")
             return schema
@@ -43,7 +43,7 @@ For Auth0 setup, see requirements/execution/AUTH0_CONFIGURATION_REQUIREMENTS.md
 """
 
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, HTTPException
@@ -51,9 +51,14 @@ from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_config
-from .auth import verify_token_manual, get_token_scopes, require_scope
-from .execution_tools import federalrunner_list_wizards, federalrunner_get_wizard_info, federalrunner_execute_wizard
-from .playwright_client import PlaywrightClient
+from .auth import (
+    verify_token_manual, get_token_scopes, require_scope,
+    close_http_client, prefetch_jwks, start_jwks_refresh, stop_jwks_refresh
+)
+from .execution_tools import (
+    federalrunner_list_wizards, federalrunner_get_wizard_info, federalrunner_execute_wizard,
+    shutdown_browser
+)
 from .logging_config import get_logger
 
 # Setup logger for this module
@@ -62,9 +67,6 @@ logger = get_logger(__name__)
 # Global configuration
 config = get_config()
 
-# Global Playwright client instance
-playwright_client: Optional[PlaywrightClient] = None
-
 # Session management
 sessions: Dict[str, Dict[str, Any]] = {}  # session_id -> session data
 session_initialized: Dict[str, bool] = {}  # session_id -> initialization status
@@ -74,10 +76,11 @@ session_initialized: Dict[str, bool] = {}  # session_id -> initialization status
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for FastAPI.
-    Log startup information and handle shutdown.
+    Log startup information, warm up Auth0 JWKS, and handle shutdown.
 
-    Note: PlaywrightClient uses atomic execution (browser launched per request),
-    so no global initialization needed.
+    Note: PlaywrightClient uses atomic execution (fresh browser context per
+    request). The shared browser is launched on first use and closed here on
+    shutdown.
     """
     # Startup
     logger.info("="*60)
@@ -90,6 +93,12 @@ async def lifespan(app: FastAPI):
     logger.info(f"Port: {config.port}")
     logger.info(f"Wizards Directory: {config.wizards_dir}")
     logger.info(f"Browser: {config.browser_type} (headless={config.headless})")
+
+    # Fetch Auth0's JWKS now so the first authenticated request doesn't wait
+    # for it, then keep it fresh in the background
+    await prefetch_jwks()
+    start_jwks_refresh()
+
     logger.info("FederalRunner MCP Server ready to accept requests")
     logger.info("="*60)
 
@@ -99,6 +108,9 @@ async def lifespan(app: FastAPI):
     logger.info("="*60)
     logger.info("FederalRunner MCP Server Shutting Down")
     logger.info("="*60)
+    await stop_jwks_refresh()
+    await close_http_client()
+    await shutdown_browser()
     logger.info("FederalRunner MCP Server stopped")
 
 
@@ -413,7 +425,7 @@ async def mcp_endpoint(request: Request):
             # Validate OAuth token
             token_payload = await verify_token_manual(request)
             scopes = get_token_scopes(token_payload)
-            logger.info(f"Token scopes: {scopes}")
+            logger.info(f"Token scopes: {sorted(scopes)}")
 
             # Validate session
             session_id = request.headers.get('mcp-session-id') or request.headers.get('MCP-Session-ID')
@@ -447,7 +459,7 @@ async def mcp_endpoint(request: Request):
             # Validate OAuth token
             token_payload = await verify_token_manual(request)
             scopes = get_token_scopes(token_payload)
-            logger.info(f"Token scopes: {scopes}")
+            logger.info(f"Token scopes: {sorted(scopes)}")
 
             # Validate session
             session_id = request.headers.get('mcp-session-id') or request.headers.get('MCP-Session-ID')
@@ -609,7 +621,7 @@ def get_tools() -> list:
     ]
 
 
-async def execute_tool(tool_name: str, arguments: Dict, scopes: list) -> Dict:
+async def execute_tool(tool_name: str, arguments: Dict, scopes: FrozenSet[str]) -> Dict:
     """
     Execute the specified FederalRunner tool with given arguments.
 
@@ -72,6 +72,20 @@ def test_config():
     logger.info("=" * 80)
 
 
+@pytest.fixture(autouse=True)
+async def shared_browser():
+    """
+    Close execution_tools' shared browser after each test.
+
+    Every test runs on its own event loop (and may switch headless/browser
+    settings), so a browser launched by one test can't be reused by the next.
+    """
+    yield
+
+    from src.execution_tools import shutdown_browser
+    await shutdown_browser()
+
+
 def pytest_configure(config):
     """Configure pytest with custom markers."""
     config.addinivalue_line(
@@ -39,6 +39,11 @@ class FederalScoutConfig(BaseSettings):
         description="HTTP/WebSocket endpoint to connect to existing browser (for demos). Use 'http://localhost:9222' with start_browser_for_demo.py script. If set, connects instead of launching new browser."
     )
 
+    user_data_dir: Optional[Path] = Field(
+        default=None,
+        description="Persistent browser profile directory. If set, the browser is started with launch_persistent_context so the warmed profile (caches, fonts, prefs) is reused across launches. One session per directory at a time - sessions do not share the browser."
+    )
+
     # Session Management
     session_timeout: int = Field(
         default=1800,
@@ -121,6 +126,13 @@ class FederalScoutConfig(BaseSettings):
         description="Maximum number of HTML elements to extract per page"
     )
 
+    # MCP Response Formatting
+    pretty_json_max_chars: int = Field(
+        default=8192,
+        ge=0,
+        description="Pretty-print tool responses (indent=2) only when their estimated pretty-printed length (2x the compact JSON, in characters) is below this. 0 = always compact"
+    )
+
     # Development/Debug
     save_screenshots: bool = Field(
         default=True,
@@ -340,6 +352,7 @@ def get_test_config(temp_dir: Optional[Path] = None) -> FederalScoutConfig:
       - FEDERALSCOUT_BROWSER_TYPE=webkit|chromium|firefox
       - FEDERALSCOUT_HEADLESS=true (run headless)
       - FEDERALSCOUT_BROWSER_ENDPOINT=http://localhost:9222 (demo mode)
+      - FEDERALSCOUT_USER_DATA_DIR=/path/to/profile (reuse a warmed browser profile)
       - FEDERALSCOUT_VIEWPORT_WIDTH=1000 (viewport width)
       - FEDERALSCOUT_VIEWPORT_HEIGHT=1000 (viewport height)
 
@@ -395,5 +408,6 @@ def get_production_config() -> FederalScoutConfig:
         browser_type="webkit",  # WebKit works headless with FSA
         headless=True,          # Run in headless mode
         slow_mo=0,
-        save_screenshots=False
+        save_screenshots=False,
+        pretty_json_max_chars=0  # Always compact on the wire
     )
@@ -14,12 +14,17 @@ Reference: requirements/shared/MCP_TOOL_SPECIFICATIONS.md
 """
 
 import asyncio
+import functools
+import hashlib
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import time
 
+import orjson
+from playwright.async_api import Browser
+
 from config import get_config, FederalScoutConfig
 from logging_config import (
     get_logger,
@@ -37,7 +42,7 @@ from models import (
     SelectorType,
     InteractionType
 )
-from playwright_client import BrowserSession
+from playwright_client import BrowserSession, PlaywrightClient
 
 
 logger = get_logger(__name__)
@@ -46,6 +51,68 @@ logger = get_logger(__name__)
 # Global session storage
 _active_sessions: Dict[str, BrowserSession] = {}
 
+# Shared browser process reused by every discovery session (each session gets its own context).
+# Holds the PlaywrightClient that launched it so its (playwright, browser) pair can be shut down.
+_BROWSER_SINGLETON: Optional[PlaywrightClient] = None
+_browser_lock = asyncio.Lock()
+
+
+async def _get_shared_browser(config: FederalScoutConfig):
+    """
+    Get the process-wide browser, launching it on first use.
+
+    Repeated start_discovery calls (including after Claude Desktop re-sends
+    initialize) reuse the running browser and only pay for a new context.
+    Relaunches if the browser has disconnected (e.g. crashed), stopping the
+    stale launcher's Playwright driver first.
+
+    Args:
+        config: FederalScout configuration with browser settings
+
+    Returns:
+        Launched Browser instance
+    """
+    global _BROWSER_SINGLETON
+    async with _browser_lock:
+        if _BROWSER_SINGLETON is None or not _BROWSER_SINGLETON.browser.is_connected():
+            if _BROWSER_SINGLETON is not None:
+                stale, _BROWSER_SINGLETON = _BROWSER_SINGLETON, None
+                try:
+                    await stale.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close disconnected shared browser: {e}")
+            launcher = PlaywrightClient(config)
+            try:
+                await launcher.launch()
+            except Exception:
+                await launcher.close()
+                raise
+            _BROWSER_SINGLETON = launcher
+            logger.info("🚀 Shared browser launched for discovery sessions")
+    return _BROWSER_SINGLETON.browser
+
+
+async def shutdown_browsers():
+    """
+    Close every discovery session and the shared browser.
+
+    Called from the server's shutdown path so no browser processes are
+    left behind when the MCP server exits.
+    """
+    global _BROWSER_SINGLETON
+    for session_id in list(_active_sessions):
+        session = _active_sessions.pop(session_id)
+        try:
+            await session.close()
+        except Exception as e:
+            logger.warning(f"Failed to close session {session_id}: {e}")
+        log_session_event(session_id, 'closed', logger=logger)
+
+    if _BROWSER_SINGLETON is not None:
+        launcher, _BROWSER_SINGLETON = _BROWSER_SINGLETON, None
+        await launcher.close()
+        logger.info("Shared browser shut down")
+
 
 def _cleanup_expired_sessions(config: FederalScoutConfig):
     """
@@ -87,7 +154,10 @@ def _get_session(session_id: str, silent: bool = False) -> Optional[BrowserSessi
 
 
 # Tool 1: Start Discovery
-async def federalscout_start_discovery(url: str) -> Dict[str, Any]:
+async def federalscout_start_discovery(
+    url: str,
+    browser: Optional[Browser] = None
+) -> Dict[str, Any]:
     """
     Begin wizard structure discovery session.
     
@@ -96,6 +166,9 @@ async def federalscout_start_discovery(url: str) -> Dict[str, Any]:
     
     Args:
         url: Starting URL of the government wizard
+        browser: Already-launched browser to open the session in (optional,
+            e.g. a session-scoped test fixture). Not exposed over MCP;
+            defaults to the shared server browser.
         
     Returns:
         Dictionary with session_id, screenshot, current_url, html_context, message
@@ -112,8 +185,11 @@ async def federalscout_start_discovery(url: str) -> Dict[str, Any]:
         # Generate session ID
         session_id = str(uuid.uuid4())
 
-        # Create browser session
-        session = BrowserSession(session_id, config)
+        # Create browser session (demo mode connects to its own browser over CDP;
+        # a persistent profile can only be opened by one session's own launch)
+        if browser is None and not (config.browser_endpoint or config.user_data_dir):
+            browser = await _get_shared_browser(config)
+        session = BrowserSession(session_id, config, browser=browser)
         _active_sessions[session_id] = session
 
         logger.info(f"🆕 NEW SESSION: {session_id}")
@@ -138,12 +214,13 @@ async def federalscout_start_discovery(url: str) -> Dict[str, Any]:
         # Wait a moment for page to settle
         await asyncio.sleep(1)
 
-        # Capture screenshot
-        screenshot_b64, size, screenshot_file = await session.client.capture_screenshot()
+        # Capture screenshot and extract HTML context concurrently
+        # (both only read the settled page; extraction runs during the zoom waits)
+        (screenshot_b64, size, screenshot_file), html_context = await asyncio.gather(
+            session.client.capture_screenshot(),
+            session.client.extract_html_context()
+        )
         logger.info(f"📸 Screenshot: {screenshot_file} ({size} bytes)")
-
-        # Extract HTML context
-        html_context = await session.client.extract_html_context()
         
         # Get current URL
         current_url = await session.client.get_current_url()
@@ -263,12 +340,13 @@ async def federalscout_click_element(
             # Network idle timeout is not critical - page may still be usable
             logger.debug(f"Network idle timeout (non-critical): {e}")
 
-        # Capture screenshot
-        screenshot_b64, size, screenshot_file = await session.client.capture_screenshot()
+        # Capture screenshot and extract HTML context concurrently
+        # (both only read the settled page; extraction runs during the zoom waits)
+        (screenshot_b64, size, screenshot_file), html_context = await asyncio.gather(
+            session.client.capture_screenshot(),
+            session.client.extract_html_context()
+        )
         logger.info(f"📸 Screenshot: {screenshot_file} ({size} bytes)")
-
-        # Extract HTML context
-        html_context = await session.client.extract_html_context()
         
         # Get current URL
         current_url = await session.client.get_current_url()
@@ -303,10 +381,66 @@ async def federalscout_click_element(
         }
 
 
+async def _batch_action_failed(
+    session: BrowserSession,
+    idx: int,
+    action_dict: Dict[str, Any],
+    error: Optional[str],
+    completed_count: int,
+    total_actions: int
+) -> Dict[str, Any]:
+    """
+    Build the fail-fast result for federalscout_execute_actions.
+
+    Args:
+        session: Active discovery session
+        idx: 1-based index of the failed action
+        action_dict: The action that failed
+        error: Error message from the failed action
+        completed_count: Actions completed before the failure
+        total_actions: Number of actions in the batch
+
+    Returns:
+        Error result with failed_at, completed_count and a screenshot
+    """
+    logger.warning(
+        f"  ❌ Failed action {idx}: {error} - skipping remaining "
+        f"{total_actions - idx} action(s)"
+    )
+
+    # Try to capture screenshot so the failure can be seen
+    try:
+        screenshot_b64, _, screenshot_file = await session.client.capture_screenshot()
+        logger.info(f"📸 Screenshot (error): {screenshot_file}")
+    except Exception:
+        screenshot_b64 = None
+
+    session.update_activity()
+
+    return {
+        'success': False,
+        'error': f"Action {idx} failed: {error}",
+        'error_type': 'action_failed',
+        'failed_at': idx,
+        'failed_action': action_dict,
+        'completed_count': completed_count,
+        'total_actions': total_actions,
+        'screenshot': screenshot_b64,
+        'suggestion': (
+            f"Actions 1-{completed_count} were applied. Fix action {idx} "
+            "(check the selector with federalscout_get_page_info, or add wait_before "
+            "for a conditional field) and resend it with the remaining actions."
+        ) if completed_count else (
+            "No actions were applied. Check the selector with federalscout_get_page_info, "
+            "or add wait_before for a conditional field."
+        )
+    }
+
+
 # Tool 3: Execute Diverse Actions (UNIVERSAL BATCH)
 async def federalscout_execute_actions(
     session_id: str,
-    actions: List[Dict[str, str]]
+    actions: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
     """
     Execute multiple diverse actions in sequence (fill, click, etc.) with ONE screenshot at the end.
@@ -320,6 +454,9 @@ async def federalscout_execute_actions(
             - selector: CSS selector or text for the element
             - value: Value to fill (required for fill/fill_enter/select, optional for click)
             - selector_type: How to find element (optional, defaults to 'auto', options: 'text', 'id', 'css', 'auto')
+            - wait_before: Wait for an element before this action (optional):
+              {selector (defaults to the action's selector), state (default 'attached'), timeout (ms, default 3000)}.
+              Lets a conditional field revealed by an earlier action be handled in the same batch.
 
     Example - Mixed actions:
         actions = [
@@ -327,11 +464,16 @@ async def federalscout_execute_actions(
             {"action": "fill", "selector": "#fsa_Input_DateOfBirthMonth", "value": "05"},
             {"action": "fill", "selector": "#fsa_Input_DateOfBirthDay", "value": "15"},
             {"action": "fill_enter", "selector": "#fsa_Typeahead_StateOfResidence", "value": "Illinois"},
+            {"action": "javascript_click", "selector": "#fsa_Radio_CollegeLevelFreshman",
+             "wait_before": {"selector": "#fsa_Radio_CollegeLevelFreshman", "state": "attached"}},
             {"action": "click", "selector": "Continue", "selector_type": "text"}
         ]
 
     Returns:
-        Dictionary with success, screenshot (taken AFTER all actions), completed_count, failed_actions
+        Dictionary with success, screenshot (taken AFTER all actions), completed_count.
+        Stops at the first failing action: the remaining actions are skipped and
+        the result has success=False, failed_at (1-based index), completed_count
+        and a screenshot of the page at the point of failure.
     """
     start_time = time.time()
 
@@ -351,7 +493,6 @@ async def federalscout_execute_actions(
             }
 
         completed_count = 0
-        failed_actions = []
 
         logger.info(f"⚡ Batch executing {len(actions)} diverse actions")
 
@@ -363,12 +504,10 @@ async def federalscout_execute_actions(
             selector_type = action_dict.get('selector_type', 'auto')
 
             if not action_type or not selector:
-                failed_actions.append({
-                    'index': idx,
-                    'action': action_dict,
-                    'error': 'Missing action type or selector'
-                })
-                continue
+                return await _batch_action_failed(
+                    session, idx, action_dict, 'Missing action type or selector',
+                    completed_count, len(actions)
+                )
 
             # Log the action
             action_descriptions = {
@@ -386,6 +525,14 @@ async def federalscout_execute_actions(
 
             # Execute based on action type
             try:
+                wait_before = action_dict.get('wait_before')
+                if wait_before:
+                    await session.client.page.wait_for_selector(
+                        wait_before.get('selector') or selector,
+                        state=wait_before.get('state', 'attached'),
+                        timeout=wait_before.get('timeout', 3000)
+                    )
+
                 if action_type in ['fill', 'fill_enter', 'select']:
                     # Field filling actions
                     interaction = InteractionType(action_type)
@@ -403,17 +550,15 @@ async def federalscout_execute_actions(
             except Exception as e:
                 error = str(e)
 
-            if success:
-                completed_count += 1
-                # Small delay between actions
-                await asyncio.sleep(0.3)
-            else:
-                failed_actions.append({
-                    'index': idx,
-                    'action': action_dict,
-                    'error': error
-                })
-                logger.warning(f"  ❌ Failed action {idx}: {error}")
+            if not success:
+                # Fail fast - later actions usually depend on this one
+                return await _batch_action_failed(
+                    session, idx, action_dict, error, completed_count, len(actions)
+                )
+
+            completed_count += 1
+            # Small delay between actions
+            await asyncio.sleep(0.3)
 
         # Wait for any page changes/navigation to settle
         try:
@@ -434,11 +579,7 @@ async def federalscout_execute_actions(
             'screenshot': screenshot_b64,
             'completed_count': completed_count,
             'total_actions': len(actions),
-            'failed_actions': failed_actions,
-            'message': (
-                f"Batch executed {completed_count}/{len(actions)} actions successfully. "
-                f"{'No failures.' if not failed_actions else f'{len(failed_actions)} failed.'}"
-            )
+            'message': f"Batch executed {completed_count}/{len(actions)} actions successfully."
         }
 
         execution_time = (time.time() - start_time) * 1000
@@ -460,6 +601,75 @@ async def federalscout_execute_actions(
         }
 
 
+# Tool 3b: Wait For Element
+async def federalscout_wait_for(
+    session_id: str,
+    selector: str,
+    state: str = "attached",
+    timeout: int = 3000
+) -> Dict[str, Any]:
+    """
+    Wait until an element reaches a state (e.g. a conditional field appears).
+
+    Event-driven replacement for fixed sleeps: returns as soon as the DOM
+    matches instead of always waiting the worst case.
+
+    Args:
+        session_id: Session ID from start_discovery
+        selector: CSS selector of the element to wait for
+        state: 'attached', 'detached', 'visible' or 'hidden' (default: 'attached')
+        timeout: Maximum wait in milliseconds (default: 3000)
+
+    Returns:
+        Dictionary with success, selector, state
+    """
+    start_time = time.time()
+
+    log_tool_call('federalscout_wait_for', {
+        'session_id': session_id,
+        'selector': selector,
+        'state': state
+    }, logger=logger)
+
+    try:
+        # Get session
+        session = _get_session(session_id)
+        if not session:
+            return {
+                'success': False,
+                'error': f"Session not found: {session_id}",
+                'error_type': 'invalid_session'
+            }
+
+        logger.info(f"⏳ Waiting for '{selector}' to be {state}")
+        await session.client.page.wait_for_selector(selector, state=state, timeout=timeout)
+
+        # Update session activity
+        session.update_activity()
+
+        execution_time = (time.time() - start_time) * 1000
+        log_tool_result('federalscout_wait_for', True, execution_time, logger=logger)
+
+        return {
+            'success': True,
+            'selector': selector,
+            'state': state
+        }
+
+    except Exception as e:
+        error_msg = f"Element '{selector}' not {state} within {timeout}ms: {str(e)}"
+        logger.error(error_msg)
+
+        execution_time = (time.time() - start_time) * 1000
+        log_tool_result('federalscout_wait_for', False, execution_time, error_msg, logger=logger)
+
+        return {
+            'success': False,
+            'error': error_msg,
+            'error_type': 'wait_timeout'
+        }
+
+
 # Tool 4: Get Page Info
 async def federalscout_get_page_info(session_id: str) -> Dict[str, Any]:
     """
@@ -639,7 +849,6 @@ async def federalscout_save_page_metadata(
         partial_wizard_path = config.wizards_dir / f"_partial_{session_id}.json"
 
         try:
-            import json
             from models import WizardStructure, StartAction
 
             # Build partial wizard structure with what we have so far
@@ -654,9 +863,14 @@ async def federalscout_save_page_metadata(
                 pages=session.pages_discovered
             )
 
-            # Save to partial file
-            with open(partial_wizard_path, 'w') as f:
-                json.dump(partial_wizard.model_dump(exclude_none=True), f, indent=2, default=str)
+            # Save to partial file - written in a worker thread so the event loop
+            # (and the live browser session) isn't blocked on disk I/O
+            partial_json = orjson.dumps(
+                partial_wizard.model_dump(exclude_none=True),
+                option=orjson.OPT_INDENT_2,
+                default=str
+            )
+            await asyncio.to_thread(partial_wizard_path.write_bytes, partial_json)
 
             logger.info(f"📄 Incremental save: {partial_wizard_path.name} ({len(session.pages_discovered)} pages)")
 
@@ -697,6 +911,30 @@ async def federalscout_save_page_metadata(
         }
 
 
+# Universal Wizard Structure Schema (Contract-First pattern)
+UNIVERSAL_SCHEMA_PATH = Path(__file__).parent.parent.parent.parent / "schemas" / "wizard-structure-v1.schema.json"
+
+
+@functools.lru_cache(maxsize=1)
+def _universal_schema_validator():
+    """
+    Draft-07 validator for the Universal Wizard Structure Schema.
+
+    The schema file is read and parsed once per process; later discoveries
+    (and the test suite) reuse the same validator.
+
+    Returns:
+        Draft7Validator for the universal schema, or None if the schema
+        file is missing
+    """
+    if not UNIVERSAL_SCHEMA_PATH.exists():
+        return None
+
+    from jsonschema import Draft7Validator
+
+    return Draft7Validator(orjson.loads(UNIVERSAL_SCHEMA_PATH.read_bytes()))
+
+
 # Tool 6: Complete Discovery
 async def federalscout_complete_discovery(
     session_id: str,
@@ -722,7 +960,8 @@ async def federalscout_complete_discovery(
         Dictionary with:
             - success (bool): Whether discovery completed successfully
             - wizard_id (str): Filename of saved wizard JSON
-            - saved_to (str): Full path where wizard was saved
+            - saved_to (str): Full path where wizard was saved (file is written and
+              closed before success is returned - no need to re-check it exists)
             - wizard_structure (dict): Complete wizard JSON structure (use this to create artifact!)
             - validation (dict): Validation results showing completeness
 
@@ -799,23 +1038,14 @@ async def federalscout_complete_discovery(
         # NEW: Validate against universal Wizard Structure Schema
         wizard_json = wizard_structure.model_dump(mode='json', exclude_none=True)
         try:
-            import json
-            from jsonschema import validate as json_schema_validate, Draft7Validator
-            from pathlib import Path
-
-            # Load universal schema
-            project_root = Path(__file__).parent.parent.parent.parent
-            schema_path = project_root / "schemas" / "wizard-structure-v1.schema.json"
-
-            if schema_path.exists():
-                with open(schema_path, 'r') as f:
-                    universal_schema = json.load(f)
+            validator = _universal_schema_validator()
 
+            if validator is not None:
                 # Validate wizard data against universal schema
-                json_schema_validate(wizard_json, universal_schema)
+                validator.validate(wizard_json)
                 logger.info("✅ Wizard structure validates against universal schema")
             else:
-                logger.warning(f"⚠️  Universal schema not found at: {schema_path}")
+                logger.warning(f"⚠️  Universal schema not found at: {UNIVERSAL_SCHEMA_PATH}")
 
         except Exception as e:
             logger.error(f"❌ Schema validation failed: {str(e)}")
@@ -860,15 +1090,14 @@ async def federalscout_complete_discovery(
         logger.info(f"   Browser will remain visible for demonstration")
         logger.info(f"   Session will auto-cleanup after {config.session_timeout}s timeout")
         
-        # Convert wizard structure to dict using mode='json' to handle datetime serialization
-        # This ensures all datetime objects are converted to ISO format strings
-        wizard_dict = wizard_structure.model_dump(mode='json', exclude_none=True)
-
+        # Return the dict already dumped for schema validation (mode='json' converts
+        # datetimes to ISO strings) - it matches the file contents, so callers need
+        # not re-read and re-parse saved_to
         result = {
             'success': True,
             'wizard_id': f"{wizard_id}.json",
             'saved_to': str(output_path),
-            'wizard_structure': wizard_dict,
+            'wizard_structure': wizard_json,
             'validation': validation
         }
         
@@ -904,6 +1133,27 @@ async def federalscout_complete_discovery(
         }
 
 
+@functools.lru_cache(maxsize=1)
+def _schema_meta_validator():
+    """
+    Draft-07 meta-schema validator used to check User Data Schemas.
+
+    Built once and reused: Draft7Validator.check_schema constructs a new
+    meta-schema validator (and format checker) on every call. The 'regex'
+    format check on property patterns goes through re.compile, whose
+    module-level cache already makes repeated patterns free.
+
+    Returns:
+        Draft7Validator for the draft-07 meta-schema
+    """
+    from jsonschema import Draft7Validator
+
+    return Draft7Validator(
+        Draft7Validator.META_SCHEMA,
+        format_checker=Draft7Validator.FORMAT_CHECKER
+    )
+
+
 # Tool 7: Save User Data Schema
 async def federalscout_save_schema(
     wizard_id: str,
@@ -924,7 +1174,9 @@ async def federalscout_save_schema(
     Returns:
         Dictionary with:
             - success (bool): Whether schema was saved successfully
-            - schema_path (str): Path where schema was saved
+            - schema_path (str): Path where schema was saved (written and closed
+              before success is returned)
+            - sha256 (str): SHA-256 hex digest of the bytes written to schema_path
             - validation (dict): Schema validation results
 
     Example schema_content:
@@ -959,10 +1211,14 @@ async def federalscout_save_schema(
 
         # Validate schema_content is a valid JSON Schema (draft-07)
         try:
-            from jsonschema import Draft7Validator
-
-            # Check schema is valid
-            Draft7Validator.check_schema(schema_content)
+            from jsonschema.exceptions import SchemaError, best_match
+
+            # Check schema is valid (same check as Draft7Validator.check_schema,
+            # without rebuilding the meta-schema validator per call). best_match picks
+            # the most relevant error rather than whichever iter_errors yields first
+            error = best_match(_schema_meta_validator().iter_errors(schema_content))
+            if error is not None:
+                raise SchemaError.create_from(error)
             logger.info("✅ Schema is valid JSON Schema (draft-07)")
 
         except Exception as e:
@@ -997,9 +1253,8 @@ async def federalscout_save_schema(
         # Save schema to file
         schema_path = schema_dir / f"{wizard_id}-schema.json"
 
-        import json
-        with open(schema_path, 'w') as f:
-            json.dump(schema_content, f, indent=2)
+        schema_bytes = orjson.dumps(schema_content, option=orjson.OPT_INDENT_2)
+        schema_path.write_bytes(schema_bytes)
 
         logger.info("━" * 80)
         logger.info(f"✅ USER DATA SCHEMA SAVED!")
@@ -1012,6 +1267,7 @@ async def federalscout_save_schema(
         result = {
             'success': True,
             'schema_path': str(schema_path),
+            'sha256': hashlib.sha256(schema_bytes).hexdigest(),
             'wizard_id': wizard_id,
             'validation': {
                 'is_valid': True,
@@ -1048,6 +1304,7 @@ __all__ = [
     'federalscout_start_discovery',
     'federalscout_click_element',
     'federalscout_execute_actions',  # Universal batch action tool (click + fill + everything)
+    'federalscout_wait_for',
     'federalscout_get_page_info',
     'federalscout_save_page_metadata',
     'federalscout_complete_discovery',
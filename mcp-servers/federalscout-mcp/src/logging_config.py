@@ -6,7 +6,11 @@ IMPORTANT: Logs to FILE not stdout, since stdio is used for MCP communication.
 Reference: requirements/discovery/DISCOVERY_REQUIREMENTS.md
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +18,10 @@ from typing import Optional
 import json
 
 
+# Background listener that drains queued records to the file handler
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
 class StructuredFormatter(logging.Formatter):
     """
     Formatter that outputs structured JSON logs.
@@ -71,6 +79,34 @@ class SessionLoggerAdapter(logging.LoggerAdapter):
         return msg, kwargs
 
 
+class InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a same-process listener thread.
+
+    The stock prepare() formats the record and strips exc_info so it can be
+    pickled. Our queue never leaves the process, so we only merge msg/args
+    (args may be mutated after the call returns) and keep exc_info intact
+    for the file handler's formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_queue_listener():
+    """Stop the background listener, flushing any queued records."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def setup_logging(
     log_file: Optional[Path] = None,
     level: int = logging.INFO,
@@ -79,6 +115,9 @@ def setup_logging(
     """
     Set up logging for FederalScout.
 
+    Records are handed to a QueueHandler and written to the log file by a
+    QueueListener thread, so tool handlers never block on file I/O.
+
     Args:
         log_file: Path to log file (if None, uses default from config)
         level: Logging level (default: INFO)
@@ -87,11 +126,14 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    global _queue_listener
+
     # Get or create logger
     logger = logging.getLogger('federalscout')
     logger.setLevel(level)
 
-    # Remove existing handlers
+    # Remove existing handlers (flush and stop any previous listener first)
+    _stop_queue_listener()
     logger.handlers.clear()
 
     # Determine log file path
@@ -117,7 +159,17 @@ def setup_logging(
         )
     
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # Route records through a queue; the listener thread owns the file handler
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = InProcessQueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    logger.addHandler(queue_handler)
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
     
     # Don't propagate to root logger
     logger.propagate = False
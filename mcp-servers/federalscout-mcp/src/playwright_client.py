@@ -14,6 +14,7 @@ import asyncio
 import base64
 import io
 import logging
+from dataclasses import InitVar, dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -21,6 +22,7 @@ from datetime import datetime, timedelta
 from playwright.async_api import (
     async_playwright,
     Browser,
+    BrowserContext,
     Page,
     Playwright,
     TimeoutError as PlaywrightTimeoutError
@@ -34,6 +36,170 @@ from models import InteractionType, SelectorType
 
 logger = get_logger(__name__)
 
+# Max wait when connecting to an existing (demo) browser before launching our own
+BROWSER_CONNECT_TIMEOUT_MS = 5000
+
+
+# Page scripts passed to page.evaluate. Kept constant (values go in as
+# arguments, never interpolated) so the script text is identical on every
+# call and selectors can't break out of the JS string.
+
+_CLICK_BY_ID_JS = "(id) => document.getElementById(id).click()"
+
+_CLICK_BY_SELECTOR_JS = "(selector) => document.querySelector(selector).click()"
+
+_SET_ZOOM_JS = "(zoom) => { document.body.style.zoom = `${zoom}%`; }"
+
+# Measures content height, zooms out to fit (20-100%), scrolls to top and
+# resolves once the zoomed page has been painted
+_ZOOM_TO_FIT_JS = """
+    async () => {
+        // Find the main form container
+        const form = document.querySelector('form') || document.body;
+
+        // Get all form fields to find the bottom-most one
+        const fields = Array.from(form.querySelectorAll('input, select, textarea, button, label'));
+
+        let maxBottom = 0;
+        for (const field of fields) {
+            const rect = field.getBoundingClientRect();
+            // Use pageYOffset to convert viewport coordinates to document coordinates
+            const absoluteBottom = rect.bottom + window.pageYOffset;
+            maxBottom = Math.max(maxBottom, absoluteBottom);
+        }
+
+        // Also check form container height (use scrollHeight for actual content height)
+        const formScrollHeight = form.scrollHeight;
+        const formTop = form.getBoundingClientRect().top + window.pageYOffset;
+        const formContentHeight = formTop + formScrollHeight;
+
+        // Also check document body full height
+        const bodyHeight = document.body.scrollHeight;
+
+        const contentHeight = Math.max(maxBottom, formContentHeight, bodyHeight);
+        const viewportHeight = window.innerHeight;
+        const scrollY = window.pageYOffset;
+
+        // Very aggressive zoom to fit as much as possible in fixed 1000x1000 window
+        // Clamp between 20-100% (lower limit of 20% allows up to 5000px content in 1000px viewport)
+        let zoom = 100;
+        if (contentHeight > viewportHeight) {
+            zoom = Math.max(20, Math.min(Math.floor((viewportHeight / contentHeight) * 100), 100));
+        }
+
+        // Only apply if we're actually zooming out
+        if (zoom < 100) {
+            document.body.style.zoom = `${zoom}%`;
+            // Scroll to top to ensure we start from beginning
+            window.scrollTo(0, 0);
+
+            // Wait for the next rendered frame (two rAFs) instead of a fixed delay.
+            // Capped at 300ms in case frames aren't produced (hidden headed window).
+            await Promise.race([
+                new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve))),
+                new Promise(resolve => setTimeout(resolve, 300))
+            ]);
+        }
+
+        return { contentHeight, viewportHeight, scrollY, zoom };
+    }
+"""
+
+# Interactive elements (inputs, selects, textareas, buttons) on the page
+_HTML_CONTEXT_JS = """
+    ({ maxElements, forDiscovery }) => {
+        const getElementInfo = (el) => ({
+            tag: el.tagName.toLowerCase(),
+            type: el.type || null,
+            id: el.id || null,
+            name: el.name || null,
+            visible: el.offsetParent !== null
+        });
+
+        // Exclude chat, feedback, help elements (compiled once per call, not per element)
+        const excludePattern = /chat|Chat|feedback|help|Help|minimize|Minimize|audio|Audio|close|Close|timeout|Timeout/;
+
+        // Filter function for discovery mode - exclude chat, feedback, etc.
+        const isFormRelevant = (el) => {
+            const id = el.id || '';
+            const className = el.className || '';
+            return !(excludePattern.test(id) || excludePattern.test(className));
+        };
+
+        // One pass over all form controls, bucketed by kind (document order is kept).
+        // Submit/button inputs are both inputs and buttons, as before.
+        const inputs = [], selects = [], textareas = [], buttons = [];
+        for (const el of document.querySelectorAll('input, select, textarea, button')) {
+            // Filter for discovery mode
+            if (forDiscovery && !isFormRelevant(el)) {
+                continue;
+            }
+
+            switch (el.tagName) {
+                case 'INPUT':
+                    inputs.push(el);
+                    if (el.type === 'submit' || el.type === 'button') {
+                        buttons.push(el);
+                    }
+                    break;
+                case 'SELECT':
+                    selects.push(el);
+                    break;
+                case 'TEXTAREA':
+                    textareas.push(el);
+                    break;
+                default:
+                    buttons.push(el);
+            }
+        }
+
+        return {
+            inputs: inputs.slice(0, maxElements).map(getElementInfo),
+            selects: selects.slice(0, maxElements).map(el => ({
+                ...getElementInfo(el),
+                options: Array.from(el.options).slice(0, 10).map(opt => opt.text)
+            })),
+            textareas: textareas.slice(0, maxElements).map(getElementInfo),
+            buttons: buttons.slice(0, maxElements).map(getElementInfo)
+        };
+    }
+"""
+
+
+def _reencode_to_budget(screenshot_bytes: bytes, quality: int, max_bytes: int) -> bytes:
+    """
+    Re-encode a JPEG at decreasing quality until it fits max_bytes.
+
+    Tries `quality`, then steps down by 10 while the quality stays above 20
+    (80 -> 70 -> ... -> 30 for the default), and returns the last encoding
+    even if it is still over budget. No attempt exceeds `quality`.
+
+    Args:
+        screenshot_bytes: Original JPEG bytes
+        quality: Quality the original was captured at
+        max_bytes: Target maximum size in bytes
+
+    Returns:
+        Re-encoded JPEG bytes
+    """
+    # Load image
+    image = Image.open(io.BytesIO(screenshot_bytes))
+
+    # Reduce quality until it fits
+    output = io.BytesIO()
+
+    while True:
+        output.seek(0)
+        output.truncate()
+        image.save(output, format='JPEG', quality=quality, optimize=True)
+
+        if output.tell() <= max_bytes or quality - 10 <= 20:
+            break
+
+        quality -= 10
+
+    return output.getvalue()
+
 
 class PlaywrightClient:
     """
@@ -43,30 +209,40 @@ class PlaywrightClient:
     with patterns optimized for government form wizards.
     """
     
-    def __init__(self, config: Optional[FederalScoutConfig] = None):
+    def __init__(
+        self,
+        config: Optional[FederalScoutConfig] = None,
+        browser: Optional[Browser] = None
+    ):
         """
         Initialize Playwright client.
 
         Args:
             config: FederalScout configuration (uses default if None)
+            browser: Already-launched browser to share (optional). When given,
+                pages are opened in a private BrowserContext and close() only
+                closes that context - the browser stays up for other sessions.
         """
         self.config = config or get_config()
         self.playwright: Optional[Playwright] = None
-        self.browser: Optional[Browser] = None
+        self.browser: Optional[Browser] = browser
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self._is_launched = False
+        self._owns_browser = browser is None
+        self._is_launched = browser is not None
         
     async def launch(self) -> Browser:
         """
         Launch Playwright browser or connect to existing one.
 
         If browser_endpoint is configured, connects to existing browser (demo mode).
-        Otherwise, launches a new browser.
+        If user_data_dir is configured, launches a persistent context on that
+        profile (self.context). Otherwise, launches a new browser.
 
         Returns:
-            Browser instance
+            Browser instance (None for a persistent context without a Browser object)
         """
-        if self._is_launched and self.browser:
+        if self._is_launched and (self.browser or self.context):
             return self.browser
 
         self.playwright = await async_playwright().start()
@@ -77,19 +253,13 @@ class PlaywrightClient:
             try:
                 # Connect via HTTP endpoint (Playwright will auto-discover WebSocket)
                 # This works with predefined endpoints like http://localhost:9222
-                endpoint = self.config.browser_endpoint
-
-                # If HTTP endpoint, Playwright will fetch the WebSocket URL automatically
-                if endpoint.startswith('http://'):
-                    # Playwright handles HTTP → WebSocket discovery
-                    self.browser = await self.playwright.chromium.connect_over_cdp(
-                        endpoint
-                    )
-                else:
-                    # Direct WebSocket connection (backward compatibility)
-                    self.browser = await self.playwright.chromium.connect_over_cdp(
-                        endpoint
-                    )
+                # Direct WebSocket endpoints (backward compatibility) are accepted as-is.
+                # Capped so a demo browser that isn't running fails over quickly
+                # instead of after Playwright's 30s default.
+                self.browser = await self.playwright.chromium.connect_over_cdp(
+                    self.config.browser_endpoint,
+                    timeout=BROWSER_CONNECT_TIMEOUT_MS
+                )
 
                 self._is_launched = True
                 logger.info("✅ Connected to existing browser for demo")
@@ -109,10 +279,30 @@ class PlaywrightClient:
         else:  # default to chromium
             browser_engine = self.playwright.chromium
 
+        launch_args = self.config.browser_args if self.config.browser_type == "chromium" else []
+
+        if self.config.user_data_dir:
+            # Reuse a warmed profile instead of initializing a fresh one on every cold start.
+            # Extensions installed in the profile would otherwise load on every launch
+            if self.config.browser_type == "chromium":
+                launch_args = [*launch_args, '--disable-extensions']
+            self.config.user_data_dir.mkdir(parents=True, exist_ok=True)
+            self.context = await browser_engine.launch_persistent_context(
+                str(self.config.user_data_dir),
+                headless=self.config.headless,
+                slow_mo=self.config.slow_mo,
+                args=launch_args,
+                viewport=self.config.viewport_size
+            )
+            self.browser = self.context.browser
+            self._is_launched = True
+            logger.info(f"Persistent browser context launched (profile={self.config.user_data_dir})")
+            return self.browser
+
         self.browser = await browser_engine.launch(
             headless=self.config.headless,
             slow_mo=self.config.slow_mo,
-            args=self.config.browser_args if self.config.browser_type == "chromium" else []
+            args=launch_args
         )
 
         self._is_launched = True
@@ -148,9 +338,19 @@ class PlaywrightClient:
                 return self.page
 
         # Normal mode: create a new page
-        self.page = await self.browser.new_page(
-            viewport=self.config.viewport_size
-        )
+        if self._owns_browser and self.context:
+            # Persistent context opens with a blank page - use it
+            self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        elif self._owns_browser:
+            self.page = await self.browser.new_page(
+                viewport=self.config.viewport_size
+            )
+        else:
+            # Shared browser: isolate this session in its own context (cheap vs. a browser launch)
+            self.context = await self.browser.new_context(
+                viewport=self.config.viewport_size
+            )
+            self.page = await self.context.new_page()
 
         # Set default timeouts
         self.page.set_default_navigation_timeout(self.config.navigation_timeout)
@@ -238,10 +438,9 @@ class PlaywrightClient:
             
             # Extract ID for JavaScript
             if selector.startswith('#'):
-                element_id = selector[1:]
-                await self.page.evaluate(f'document.getElementById("{element_id}").click()')
+                await self.page.evaluate(_CLICK_BY_ID_JS, selector[1:])
             else:
-                await self.page.evaluate(f'document.querySelector("{selector}").click()')
+                await self.page.evaluate(_CLICK_BY_SELECTOR_JS, selector)
             
             log_browser_action('javascript_click', selector, success=True, logger=logger)
             return (True, None)
@@ -406,13 +605,9 @@ class PlaywrightClient:
             # Apply intelligent zoom to fit more content (no viewport resizing!)
             original_zoom = None
             if apply_zoom:
+                # Zooms out and scrolls to top in the same round trip as the measurement
                 original_zoom = await self._apply_intelligent_zoom()
 
-                # Scroll to top to ensure we start from beginning
-                if original_zoom is not None:
-                    await self.page.evaluate('window.scrollTo(0, 0)')
-                    await self.page.wait_for_timeout(300)  # Wait for scroll to complete
-
             # Capture screenshot as bytes
             # Window stays fixed at 1000x1000, we just zoom content to fit
             screenshot_bytes = await self.page.screenshot(
@@ -423,8 +618,7 @@ class PlaywrightClient:
 
             # Restore original zoom if we changed it
             if original_zoom is not None:
-                await self.page.evaluate(f'() => {{ document.body.style.zoom = "{original_zoom}%"; }}')
-                await self.page.wait_for_timeout(100)  # Brief wait for zoom restoration
+                await self.page.evaluate(_SET_ZOOM_JS, original_zoom)
 
             # Optimize if needed
             if optimize and len(screenshot_bytes) > (self.config.screenshot_max_size_kb * 1024):
@@ -443,8 +637,8 @@ class PlaywrightClient:
                 screenshot_path = self.config.get_screenshot_path(filename)
                 screenshot_path.parent.mkdir(parents=True, exist_ok=True)
 
-                with open(screenshot_path, 'wb') as f:
-                    f.write(screenshot_bytes)
+                # Write off the event loop so other sessions' tool calls aren't stalled
+                await asyncio.to_thread(screenshot_path.write_bytes, screenshot_bytes)
 
                 logger.debug(f"📸 Screenshot saved: {screenshot_path.name} ({len(screenshot_bytes)} bytes)")
 
@@ -463,76 +657,33 @@ class PlaywrightClient:
         Apply intelligent zoom to fit more form content in viewport.
 
         Measure form height, calculate optimal zoom to fit as much as
-        possible while maintaining readability.
+        possible while maintaining readability, apply it and scroll to
+        top - all in a single page.evaluate round trip, which resolves
+        once the zoomed page has been painted.
 
         Returns:
             Original zoom level (for restoration), or None if zoom wasn't changed
         """
         try:
-            # Measure form content height and viewport
-            measurements = await self.page.evaluate('''
-                () => {
-                    // Find the main form container
-                    const form = document.querySelector('form') || document.body;
-
-                    // Get all form fields to find the bottom-most one
-                    const fields = Array.from(form.querySelectorAll('input, select, textarea, button, label'));
-
-                    let maxBottom = 0;
-                    for (const field of fields) {
-                        const rect = field.getBoundingClientRect();
-                        // Use pageYOffset to convert viewport coordinates to document coordinates
-                        const absoluteBottom = rect.bottom + window.pageYOffset;
-                        maxBottom = Math.max(maxBottom, absoluteBottom);
-                    }
-
-                    // Also check form container height (use scrollHeight for actual content height)
-                    const formScrollHeight = form.scrollHeight;
-                    const formTop = form.getBoundingClientRect().top + window.pageYOffset;
-                    const formContentHeight = formTop + formScrollHeight;
-
-                    // Also check document body full height
-                    const bodyHeight = document.body.scrollHeight;
-
-                    return {
-                        contentHeight: Math.max(maxBottom, formContentHeight, bodyHeight),
-                        viewportHeight: window.innerHeight,
-                        scrollY: window.pageYOffset
-                    };
-                }
-            ''')
+            # Measure form content height, then zoom out and scroll to top if needed
+            measurements = await self.page.evaluate(_ZOOM_TO_FIT_JS)
 
             content_height = measurements['contentHeight']
             viewport_height = measurements['viewportHeight']
             scroll_y = measurements['scrollY']
+            optimal_zoom = measurements['zoom']
 
             # Log measurements for debugging (INFO level so it shows in tests)
             logger.info(f"📐 Zoom calculation: content={content_height:.0f}px, viewport={viewport_height}px, scrollY={scroll_y:.0f}px")
 
-            # Calculate optimal zoom to fit content in viewport
-            if content_height > viewport_height:
-                # Calculate zoom percentage to fit content (no viewport resizing!)
-                # Very aggressive zoom to fit as much as possible in fixed 1000x1000 window
-                optimal_zoom = int((viewport_height / content_height) * 100)
-
-                # Clamp between 20-100% (very aggressive zoom for demo-friendly fixed window)
-                # Lower limit of 20% allows up to 5000px content in 1000px viewport
-                optimal_zoom = max(20, min(optimal_zoom, 100))
-
-                # Only apply if we're actually zooming out
-                if optimal_zoom < 100:
-                    await self.page.evaluate(f'() => {{ document.body.style.zoom = "{optimal_zoom}%"; }}')
-                    logger.info(f"🔍 Zoomed to {optimal_zoom}% to fit content ({content_height:.0f}px → {viewport_height}px viewport)")
-
-                    # Wait for zoom to apply
-                    await self.page.wait_for_timeout(300)
-
-                    return 100  # Return original zoom level for restoration
-                else:
-                    logger.info(f"✓ Zoom not needed - content already fits (optimal={optimal_zoom}%)")
+            if content_height <= viewport_height:
+                logger.info(f"✓ Zoom not needed - content fits in viewport")
+            elif optimal_zoom < 100:
+                logger.info(f"🔍 Zoomed to {optimal_zoom}% to fit content ({content_height:.0f}px → {viewport_height}px viewport)")
 
+                return 100  # Return original zoom level for restoration
             else:
-                logger.info(f"✓ Zoom not needed - content fits in viewport")
+                logger.info(f"✓ Zoom not needed - content already fits (optimal={optimal_zoom}%)")
 
             return None  # No zoom applied
 
@@ -544,6 +695,10 @@ class PlaywrightClient:
         """
         Optimize screenshot to reduce size.
 
+        Re-encodes at stepped-down JPEG quality until the image fits
+        screenshot_max_size_kb. Pillow's decode/encode is CPU-bound, so it
+        runs in a worker thread instead of blocking the event loop.
+
         Args:
             screenshot_bytes: Original screenshot bytes
 
@@ -551,29 +706,17 @@ class PlaywrightClient:
             Optimized screenshot bytes
         """
         try:
-            # Load image
-            image = Image.open(io.BytesIO(screenshot_bytes))
-
-            # Reduce quality if still too large
-            output = io.BytesIO()
-            quality = self.config.screenshot_quality
-
-            while quality > 20:
-                output.seek(0)
-                output.truncate()
-                image.save(output, format='JPEG', quality=quality, optimize=True)
-
-                if output.tell() <= (self.config.screenshot_max_size_kb * 1024):
-                    break
-
-                quality -= 10
-
-            return output.getvalue()
+            return await asyncio.to_thread(
+                _reencode_to_budget,
+                screenshot_bytes,
+                self.config.screenshot_quality,
+                self.config.screenshot_max_size_kb * 1024
+            )
 
         except Exception as e:
             logger.warning(f"Screenshot optimization failed: {e}, using original")
             return screenshot_bytes
-    
+
     async def extract_html_context(self, max_elements: Optional[int] = None, for_discovery: bool = False) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract interactive HTML elements from the current page.
@@ -593,61 +736,10 @@ class PlaywrightClient:
         max_elements = max_elements or self.config.max_html_elements
 
         try:
-            context = await self.page.evaluate(f"""
-            () => {{
-                const getElementInfo = (el) => ({{
-                    tag: el.tagName.toLowerCase(),
-                    type: el.type || null,
-                    id: el.id || null,
-                    name: el.name || null,
-                    visible: el.offsetParent !== null
-                }});
-
-                // Filter function for discovery mode - exclude chat, feedback, etc.
-                const isFormRelevant = (el) => {{
-                    const id = el.id || '';
-                    const className = el.className || '';
-
-                    // Exclude chat, feedback, help elements
-                    const excludePatterns = [
-                        'chat', 'Chat', 'feedback', 'help', 'Help',
-                        'minimize', 'Minimize', 'audio', 'Audio',
-                        'close', 'Close', 'timeout', 'Timeout'
-                    ];
-
-                    for (const pattern of excludePatterns) {{
-                        if (id.includes(pattern) || className.includes(pattern)) {{
-                            return false;
-                        }}
-                    }}
-
-                    return true;
-                }};
-
-                let inputs = Array.from(document.querySelectorAll('input'));
-                let selects = Array.from(document.querySelectorAll('select'));
-                let textareas = Array.from(document.querySelectorAll('textarea'));
-                let buttons = Array.from(document.querySelectorAll('button, input[type="submit"], input[type="button"]'));
-
-                // Filter for discovery mode
-                if ({str(for_discovery).lower()}) {{
-                    inputs = inputs.filter(isFormRelevant);
-                    selects = selects.filter(isFormRelevant);
-                    textareas = textareas.filter(isFormRelevant);
-                    buttons = buttons.filter(isFormRelevant);
-                }}
-
-                return {{
-                    inputs: inputs.slice(0, {max_elements}).map(getElementInfo),
-                    selects: selects.slice(0, {max_elements}).map(el => ({{
-                        ...getElementInfo(el),
-                        options: Array.from(el.options).slice(0, 10).map(opt => opt.text)
-                    }})),
-                    textareas: textareas.slice(0, {max_elements}).map(getElementInfo),
-                    buttons: buttons.slice(0, {max_elements}).map(getElementInfo)
-                }};
-            }}
-            """)
+            context = await self.page.evaluate(
+                _HTML_CONTEXT_JS,
+                {'maxElements': max_elements, 'forDiscovery': for_discovery}
+            )
 
             logger.debug(f"Extracted HTML context: {len(context.get('inputs', []))} inputs, "
                         f"{len(context.get('buttons', []))} buttons")
@@ -687,7 +779,18 @@ class PlaywrightClient:
         if self.page:
             await self.page.close()
             self.page = None
-        
+
+        if self.context:
+            await self.context.close()
+            self.context = None
+
+        if not self._owns_browser:
+            # Shared browser is closed by its owner
+            self.browser = None
+            self._is_launched = False
+            logger.info("Browser context closed (shared browser left running)")
+            return
+
         if self.browser:
             await self.browser.close()
             self.browser = None
@@ -710,26 +813,34 @@ class PlaywrightClient:
         await self.close()
 
 
+@dataclass(slots=True, eq=False)
 class BrowserSession:
     """
     Manages a browser session for discovery.
     
-    Maintains browser state across multiple tool calls.
+    Maintains browser state across multiple tool calls. Slotted so the
+    per-call attribute lookups (client, pages_discovered) skip __dict__.
+
+    Args:
+        session_id: Unique session identifier
+        config: FederalScout configuration
+        browser: Shared browser to open this session's context in (optional)
     """
-    
-    def __init__(self, session_id: str, config: Optional[FederalScoutConfig] = None):
-        """
-        Initialize browser session.
 
-        Args:
-            session_id: Unique session identifier
-            config: FederalScout configuration
-        """
-        self.session_id = session_id
-        self.client = PlaywrightClient(config)
-        self.created_at = datetime.utcnow()
-        self.last_activity = datetime.utcnow()
-        self.pages_discovered = []
+    session_id: str
+    config: InitVar[Optional[FederalScoutConfig]] = None
+    browser: InitVar[Optional[Browser]] = None
+    client: PlaywrightClient = field(init=False)
+    created_at: datetime = field(init=False, default_factory=datetime.utcnow)
+    last_activity: datetime = field(init=False, default_factory=datetime.utcnow)
+    pages_discovered: List[Any] = field(init=False, default_factory=list)
+
+    def __post_init__(
+        self,
+        config: Optional[FederalScoutConfig],
+        browser: Optional[Browser]
+    ):
+        self.client = PlaywrightClient(config, browser=browser)
         
     def update_activity(self):
         """Update last activity timestamp."""
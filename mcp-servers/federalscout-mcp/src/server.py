@@ -8,23 +8,21 @@ Reference: requirements/discovery/DISCOVERY_REQUIREMENTS.md REQ-DISC-001
 """
 
 import asyncio
+import functools
+import signal
 import sys
+from types import ModuleType
 from typing import Any, Callable
 
+import orjson
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import best_match
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent
 
 from config import get_config
 from logging_config import get_logger, setup_logging
-from discovery_tools import (
-    federalscout_start_discovery,
-    federalscout_click_element,
-    federalscout_execute_actions,
-    federalscout_get_page_info,
-    federalscout_save_page_metadata,
-    federalscout_complete_discovery,
-    federalscout_save_schema
-)
+from stdio_buffered import open_buffered_stdin
 
 
 # Initialize logging (to file, not stdout)
@@ -78,7 +76,7 @@ TOOL_DEFINITIONS = [
     ),
     Tool(
         name="federalscout_execute_actions",
-        description="Execute multiple DIVERSE actions (fill, click, etc.) in one call (UNIVERSAL BATCH). The most powerful batch tool - drastically reduces conversation size by handling any combination of actions. Takes screenshot AFTER all actions complete. Use this when you need to combine clicks and fills in sequence.",
+        description="Execute multiple DIVERSE actions (fill, click, etc.) in one call (UNIVERSAL BATCH). The most powerful batch tool - drastically reduces conversation size by handling any combination of actions. Takes screenshot AFTER all actions complete. Stops at the first failing action (returns failed_at and completed_count). Use this when you need to combine clicks and fills in sequence.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -110,6 +108,27 @@ TOOL_DEFINITIONS = [
                                 "enum": ["text", "id", "css", "auto"],
                                 "default": "auto",
                                 "description": "How to interpret the selector (for click actions)"
+                            },
+                            "wait_before": {
+                                "type": "object",
+                                "description": "Wait for an element before running this action (e.g. a conditional field revealed by an earlier action in the same batch)",
+                                "properties": {
+                                    "selector": {
+                                        "type": "string",
+                                        "description": "CSS selector to wait for (defaults to this action's selector)"
+                                    },
+                                    "state": {
+                                        "type": "string",
+                                        "enum": ["attached", "detached", "visible", "hidden"],
+                                        "default": "attached"
+                                    },
+                                    "timeout": {
+                                        "type": "integer",
+                                        "minimum": 0,
+                                        "default": 3000,
+                                        "description": "Maximum wait in milliseconds"
+                                    }
+                                }
                             }
                         },
                         "required": ["action", "selector"]
@@ -119,6 +138,36 @@ TOOL_DEFINITIONS = [
             "required": ["session_id", "actions"]
         }
     ),
+    Tool(
+        name="federalscout_wait_for",
+        description="Wait until an element reaches a state (e.g. a conditional field appears after a previous answer). Returns as soon as the element is ready instead of sleeping a fixed time. No screenshot.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Session ID from start_discovery"
+                },
+                "selector": {
+                    "type": "string",
+                    "description": "CSS selector of the element to wait for"
+                },
+                "state": {
+                    "type": "string",
+                    "enum": ["attached", "detached", "visible", "hidden"],
+                    "description": "State to wait for (default: attached)",
+                    "default": "attached"
+                },
+                "timeout": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Maximum wait in milliseconds (default: 3000)",
+                    "default": 3000
+                }
+            },
+            "required": ["session_id", "selector"]
+        }
+    ),
     Tool(
         name="federalscout_get_page_info",
         description="Get detailed information about the current page including all form elements, buttons, and metadata. Returns element data WITHOUT screenshot to reduce conversation size. Use start_discovery, click_element, or execute_actions for screenshots.",
@@ -225,28 +274,115 @@ TOOL_DEFINITIONS = [
 ]
 
 
-# Tool name to function mapping
-TOOL_HANDLERS = {
-    "federalscout_start_discovery": federalscout_start_discovery,
-    "federalscout_click_element": federalscout_click_element,
-    "federalscout_execute_actions": federalscout_execute_actions,
-    "federalscout_get_page_info": federalscout_get_page_info,
-    "federalscout_save_page_metadata": federalscout_save_page_metadata,
-    "federalscout_complete_discovery": federalscout_complete_discovery,
-    "federalscout_save_schema": federalscout_save_schema
-}
+@functools.cache
+def _discovery_tools() -> ModuleType:
+    """
+    Import discovery_tools on first use.
+
+    discovery_tools pulls in Playwright and Pillow, which are not needed
+    to answer initialize/list_tools. Deferring the import shortens server
+    cold start in Claude Desktop.
+
+    Returns:
+        The discovery_tools module
+    """
+    import discovery_tools
+    return discovery_tools
+
+
+def _lazy_handler(name: str) -> Callable[..., Any]:
+    """Build a placeholder that resolves the real tool handler when awaited."""
+    async def handler(**arguments: Any) -> Any:
+        return await getattr(_discovery_tools(), name)(**arguments)
+
+    handler.__name__ = name
+    return handler
+
+
+# Tool name to function mapping (kept for introspection - call_tool dispatches via _resolve_handler).
+# Entries are import-deferring placeholders so the key set is available without loading Playwright.
+TOOL_HANDLERS = {tool.name: _lazy_handler(tool.name) for tool in TOOL_DEFINITIONS}
+
+
+def _resolve_handler(name: str) -> Callable[..., Any] | None:
+    """
+    Resolve a tool name to its handler.
+
+    Uses structural pattern matching on the fixed set of tool names so
+    dispatch is a literal-string match rather than a dict lookup per call.
+
+    Args:
+        name: Tool name from the MCP request
+
+    Returns:
+        Tool handler coroutine function, or None if the tool is unknown
+    """
+    match name:
+        case "federalscout_start_discovery":
+            return _discovery_tools().federalscout_start_discovery
+        case "federalscout_click_element":
+            return _discovery_tools().federalscout_click_element
+        case "federalscout_execute_actions":
+            return _discovery_tools().federalscout_execute_actions
+        case "federalscout_wait_for":
+            return _discovery_tools().federalscout_wait_for
+        case "federalscout_get_page_info":
+            return _discovery_tools().federalscout_get_page_info
+        case "federalscout_save_page_metadata":
+            return _discovery_tools().federalscout_save_page_metadata
+        case "federalscout_complete_discovery":
+            return _discovery_tools().federalscout_complete_discovery
+        case "federalscout_save_schema":
+            return _discovery_tools().federalscout_save_schema
+        case _:
+            return None
+
+
+# Tool definitions are static - build the list_tools response once at import
+_TOOLS_LIST_CACHED = tuple(TOOL_DEFINITIONS)
+
+# Argument validators compiled once per tool (schema checks, $ref and regex compilation amortized)
+TOOL_VALIDATORS = {tool.name: Draft7Validator(tool.inputSchema) for tool in TOOL_DEFINITIONS}
+
+
+def _serialize_result(result: Any) -> str:
+    """
+    Serialize a tool result to JSON text for TextContent.
+
+    Large responses (e.g. get_page_info element lists) are sent compact;
+    indent=2 roughly doubles their size on the stdio pipe. Small responses
+    stay pretty-printed for readability in Claude Desktop.
+
+    The compact encoding is produced once and also serves as the size
+    estimate (pretty-printing roughly doubles it), so large results are
+    encoded exactly once; only small ones pay a second, cheap pretty pass.
+
+    TextContent.text only accepts str, so the result has to be encoded once
+    here before the SDK wraps it in the JSON-RPC envelope. orjson does that
+    encode in a single native pass.
+
+    Args:
+        result: Tool result (JSON-serializable)
+
+    Returns:
+        JSON string
+    """
+    compact = orjson.dumps(result).decode()
+    if len(compact) * 2 < get_config().pretty_json_max_chars:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    return compact
 
 
 @server.list_tools()
-async def list_tools() -> list[Tool]:
+async def list_tools() -> tuple[Tool, ...]:
     """
     List available FederalScout discovery tools.
 
     Returns:
-        List of Tool definitions
+        Tuple of Tool definitions (precomputed at module load)
     """
     logger.info("Tools list requested")
-    return TOOL_DEFINITIONS
+    return _TOOLS_LIST_CACHED
 
 
 @server.call_tool()
@@ -261,11 +397,12 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     Returns:
         List of TextContent with tool results
     """
-    logger.info(f"Tool called: {name}")
-    logger.debug(f"Tool arguments: {arguments}")
+    # %-style args: the (possibly large) arguments dict is only formatted when DEBUG is enabled
+    logger.info("Tool called: %s", name)
+    logger.debug("Tool arguments: %r", arguments)
     
     # Get tool handler
-    handler = TOOL_HANDLERS.get(name)
+    handler = _resolve_handler(name)
     if not handler:
         error_msg = f"Unknown tool: {name}"
         logger.error(error_msg)
@@ -274,33 +411,50 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             text=f"Error: {error_msg}"
         )]
     
+    # Preflight-validate arguments against the tool's inputSchema
+    validation_error = best_match(TOOL_VALIDATORS[name].iter_errors(arguments))
+    if validation_error is not None:
+        location = '/'.join(str(p) for p in validation_error.absolute_path) or '(root)'
+        error_msg = f"Invalid arguments for {name} at {location}: {validation_error.message}"
+        logger.error(error_msg)
+        return [TextContent(
+            type="text",
+            text=_serialize_result({
+                "success": False,
+                "error": error_msg,
+                "error_type": "invalid_arguments"
+            })
+        )]
+
     try:
         # Call tool handler
         result = await handler(**arguments)
 
         # Check if result contains screenshot - use MCP image content instead of embedding in JSON
-        import json
-        content_parts = []
-
+        screenshot_b64 = None
         if isinstance(result, dict) and 'screenshot' in result:
-            screenshot_b64 = result.pop('screenshot')  # Remove from dict
+            screenshot_b64 = result.get('screenshot')
 
-            # Add screenshot as ImageContent
-            if screenshot_b64:
-                content_parts.append(ImageContent(
-                    type="image",
-                    data=screenshot_b64,
-                    mimeType="image/jpeg"
-                ))
+            # Serialize a view without the screenshot instead of mutating the handler result.
+            # Tools without a screenshot key (e.g. get_page_info) skip this branch entirely.
+            result = {k: v for k, v in result.items() if k != 'screenshot'}
 
-        # Add text content with remaining data
-        result_text = json.dumps(result, indent=2)
-        content_parts.append(TextContent(
+        # Text content with remaining data
+        text_part = TextContent(
             type="text",
-            text=result_text
-        ))
+            text=_serialize_result(result)
+        )
 
-        return content_parts
+        if screenshot_b64:
+            return [
+                ImageContent(
+                    type="image",
+                    data=screenshot_b64,
+                    mimeType="image/jpeg"
+                ),
+                text_part
+            ]
+        return [text_part]
         
     except Exception as e:
         error_msg = f"Tool execution failed: {str(e)}"
@@ -308,11 +462,11 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=_serialize_result({
                 "success": False,
                 "error": error_msg,
                 "error_type": "execution_error"
-            }, indent=2)
+            })
         )]
 
 
@@ -323,23 +477,58 @@ async def main():
     Runs the server with stdio transport for Claude Desktop.
     """
     config = get_config()
-    logger.info(f"FederalScout MCP Server initialized")
-    logger.info(f"Configuration: headless={config.headless}, session_timeout={config.session_timeout}s")
-    logger.info(f"Screenshot settings: quality={config.screenshot_quality}, max_size={config.screenshot_max_size_kb}KB")
-    logger.info(f"Wizards directory: {config.wizards_dir}")
+    # One record instead of four: a single lock acquire, format and write at startup
+    logger.info(
+        "FederalScout MCP Server initialized\n"
+        "Configuration: headless=%s, session_timeout=%ss\n"
+        "Screenshot settings: quality=%s, max_size=%sKB\n"
+        "Wizards directory: %s",
+        config.headless, config.session_timeout,
+        config.screenshot_quality, config.screenshot_max_size_kb,
+        config.wizards_dir
+    )
     
     # Import stdio transport
     from mcp.server.stdio import stdio_server
-    
+
+    # Stop on SIGTERM/SIGINT by cancelling the server; the finally below then
+    # closes the browsers (once) instead of leaving zombie browser processes
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+
+    def on_signal(sig: signal.Signals):
+        logger.info("Received %s, shutting down", sig.name)
+        main_task.cancel()
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, on_signal, sig)
+        except NotImplementedError:
+            # Windows event loops have no signal handler support
+            pass
+
+    # Read JSON-RPC frames from stdin through a reusable buffer (falls back to the SDK reader)
+    stdin = await open_buffered_stdin()
+
     # Run server with stdio transport
-    async with stdio_server() as (read_stream, write_stream):
-        logger.info("FederalScout MCP Server running with stdio transport")
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    try:
+        async with stdio_server(stdin=stdin) as (read_stream, write_stream):
+            logger.info("FederalScout MCP Server running with stdio transport")
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    except asyncio.CancelledError:
+        logger.info("FederalScout MCP Server stopped")
+    finally:
+        await _shutdown_browsers()
+
 
+async def _shutdown_browsers():
+    """Close all discovery sessions and the shared browser (only if a tool call ever loaded them)."""
+    if 'discovery_tools' in sys.modules:
+        await _discovery_tools().shutdown_browsers()
 
 if __name__ == "__main__":
     try:
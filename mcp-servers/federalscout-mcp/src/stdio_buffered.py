@@ -0,0 +1,160 @@
+"""
+Buffered stdin reader for the MCP stdio transport.
+
+The SDK's default stdin (anyio.wrap_file) hands every readline() to a
+worker thread and allocates a fresh string per read. This reader instead
+watches the stdin fd on the event loop and os.readv()s into one
+preallocated bytearray owned by an asyncio.BufferedProtocol; complete
+JSON-RPC lines are sliced out of it in place. Large argument payloads
+(HTML snapshots, selectors) no longer cost a thread hop per frame.
+
+asyncio's pipe transports only call data_received(), so the protocol's
+get_buffer()/buffer_updated() are driven directly from an add_reader
+callback rather than through connect_read_pipe.
+
+IMPORTANT: Only stdin is replaced. stdout stays on the SDK default writer.
+Only used when stdin is a pipe/FIFO (how MCP clients launch the server):
+the fd is switched to non-blocking, which affects its whole open file
+description - on a tty or socket that is often shared with stdout, so
+stdout writes could start raising BlockingIOError.
+"""
+
+import asyncio
+import os
+import stat
+import sys
+from typing import AsyncIterator, Optional
+
+from logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Size of the reusable read buffer (larger frames are assembled across reads)
+STDIN_BUFFER_SIZE = 64 * 1024
+
+
+class _StdinProtocol(asyncio.BufferedProtocol):
+    """
+    Splits newline-delimited JSON-RPC frames out of a reusable buffer.
+
+    Bytes after the last newline are carried over in a pending bytearray,
+    so a UTF-8 sequence split across two reads is only decoded once the
+    full line has arrived.
+    """
+
+    def __init__(self, buffer_size: int = STDIN_BUFFER_SIZE):
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._pending = bytearray()
+        self._lines: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._closed = False
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._view
+
+    def buffer_updated(self, nbytes: int) -> None:
+        start = 0
+        while (end := self._buffer.find(b'\n', start, nbytes)) != -1:
+            if self._pending:
+                self._pending += self._view[start:end]
+                line = self._pending.decode('utf-8')
+                self._pending.clear()
+            else:
+                line = str(self._view[start:end], 'utf-8')
+            self._lines.put_nowait(line)
+            start = end + 1
+
+        if start < nbytes:
+            self._pending += self._view[start:nbytes]
+
+    def eof_received(self) -> bool:
+        self._finish()
+        return False
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._finish()
+
+    def _finish(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._pending:
+            self._lines.put_nowait(self._pending.decode('utf-8'))
+            self._pending.clear()
+        self._lines.put_nowait(None)
+
+    async def next_line(self) -> Optional[str]:
+        return await self._lines.get()
+
+
+class BufferedStdinReader:
+    """
+    Async iterator over stdin lines, accepted as stdio_server(stdin=...).
+
+    stdio_server only consumes stdin with `async for line in stdin`, so
+    this class implements just that part of anyio.AsyncFile.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, fd: int, protocol: _StdinProtocol):
+        self._loop = loop
+        self._fd = fd
+        self._protocol = protocol
+
+    def _read_ready(self) -> None:
+        try:
+            nbytes = os.readv(self._fd, [self._protocol.get_buffer(-1)])
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self._close()
+            self._protocol.connection_lost(e)
+            return
+
+        if nbytes == 0:
+            self._close()
+            self._protocol.eof_received()
+        else:
+            self._protocol.buffer_updated(nbytes)
+
+    def _close(self) -> None:
+        if self._loop.remove_reader(self._fd):
+            os.set_blocking(self._fd, True)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        try:
+            while (line := await self._protocol.next_line()) is not None:
+                yield line
+        finally:
+            self._close()
+
+
+async def open_buffered_stdin(buffer_size: int = STDIN_BUFFER_SIZE) -> Optional[BufferedStdinReader]:
+    """
+    Attach a buffered reader to stdin.
+
+    Args:
+        buffer_size: Size of the reusable read buffer in bytes
+
+    Returns:
+        BufferedStdinReader, or None if stdin isn't a pipe/FIFO (e.g. a
+        tty, socket or regular file) or can't be watched by the event loop
+        (e.g. the Windows proactor loop). Passing None to stdio_server falls
+        back to the SDK's default reader.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        fd = sys.stdin.fileno()
+        if not stat.S_ISFIFO(os.fstat(fd).st_mode):
+            # Non-blocking mode would leak onto a tty/socket shared with stdout
+            logger.info("stdin is not a pipe, using default stdio reader")
+            return None
+        reader = BufferedStdinReader(loop, fd, _StdinProtocol(buffer_size))
+        loop.add_reader(fd, reader._read_ready)
+    except (OSError, ValueError, NotImplementedError) as e:
+        logger.info(f"Buffered stdin unavailable ({e}), using default stdio reader")
+        return None
+
+    os.set_blocking(fd, False)
+    return reader
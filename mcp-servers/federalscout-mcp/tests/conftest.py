@@ -4,18 +4,22 @@ Pytest configuration and fixtures for FederalScout tests.
 Provides shared fixtures and configuration for all tests.
 """
 
+import hashlib
 import logging
-import sys
+import os
 from pathlib import Path
 
+import orjson
 import pytest
-
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import pytest_asyncio
+from pytest_asyncio import is_async_test
 
 from config import get_test_config, set_config
 from logging_config import setup_logging
 
+# Static test data (page metadata, user data schema) shared by all tests
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
 
 @pytest.fixture(scope='session')
 def test_config():
@@ -23,8 +27,14 @@ def test_config():
     Set up test configuration for the entire test session.
     
     Creates temporary directories for test outputs and configures logging.
+    Under pytest-xdist (pytest tests/ -n 2 --dist loadgroup) each worker
+    gets its own subdirectory so saved wizard/schema files and logs
+    don't collide.
     """
     temp_dir = Path(__file__).parent / 'test_output'
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker_id:
+        temp_dir = temp_dir / worker_id
     config = get_test_config(temp_dir)
     set_config(config)
     
@@ -47,15 +57,152 @@ def test_config():
     logger.info("=" * 80)
 
 
+class LazyLog:
+    """
+    Records test progress messages without formatting them.
+
+    Messages are kept as (level, template, args) and only formatted and
+    written to the 'federalscout.test' logger by flush() - which the
+    test_log fixture calls when the test fails. Green runs skip all
+    string interpolation and handler I/O.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def info(self, msg: str, *args):
+        self.events.append((logging.INFO, msg, args))
+
+    def warning(self, msg: str, *args):
+        self.events.append((logging.WARNING, msg, args))
+
+    def flush(self, logger: logging.Logger):
+        for level, msg, args in self.events:
+            logger.log(level, msg, *args)
+        self.events.clear()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Expose each phase's report as item.rep_<phase> for fixtures to inspect."""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
 @pytest.fixture
-def session_holder():
+def test_log(request):
     """
-    Fixture to hold session ID across tests.
-    
-    Returns a dictionary that can be used to store and retrieve
-    the session ID across multiple test methods.
+    Per-test LazyLog; its events are flushed to the log only if the test failed.
     """
-    return {'session_id': None}
+    lazy_log = LazyLog()
+    yield lazy_log
+
+    report = getattr(request.node, 'rep_call', None)
+    if report is None or report.failed:
+        lazy_log.flush(logging.getLogger('federalscout.test'))
+
+
+@pytest.fixture(scope='session')
+def page1_metadata():
+    """
+    FSA Page 1 (Student Information) metadata, loaded once per session.
+
+    'url_pattern' is null in the fixture - tests fill it from the live page.
+    Shared across tests, so copy before modifying.
+    """
+    return orjson.loads((FIXTURES_DIR / 'page1_metadata.json').read_bytes())
+
+
+@pytest.fixture(scope='session')
+def user_data_schema():
+    """
+    FSA User Data Schema (THE CONTRACT) for the Page 1 field_ids, loaded once per session.
+    """
+    return orjson.loads((FIXTURES_DIR / 'user_data_schema.json').read_bytes())
+
+
+@pytest.fixture(scope='session')
+def user_data_schema_sha256(user_data_schema):
+    """
+    SHA-256 federalscout_save_schema should report for user_data_schema.
+
+    Lets tests verify the saved file without re-reading it.
+    """
+    return hashlib.sha256(orjson.dumps(user_data_schema, option=orjson.OPT_INDENT_2)).hexdigest()
+
+
+@pytest.fixture(scope='session')
+def universal_validator():
+    """
+    Draft-07 validator for the Universal Wizard Structure Schema, built once per session.
+
+    Returns None if the schema file is missing so tests can skip the check.
+    Shares complete_discovery's cached validator, so the schema file is
+    parsed once for the whole run.
+    """
+    from discovery_tools import UNIVERSAL_SCHEMA_PATH, _universal_schema_validator
+
+    validator = _universal_schema_validator()
+    if validator is None:
+        logging.getLogger('federalscout.test').warning(
+            f"⚠️  Universal Schema not found at: {UNIVERSAL_SCHEMA_PATH}"
+        )
+    return validator
+
+
+@pytest_asyncio.fixture(scope='session', loop_scope='session')
+async def session_holder(playwright_browser):
+    """
+    Registry of discovery session IDs opened by tests.
+
+    Session-scoped and append-only: each test that starts a discovery
+    session appends its session_id to holder['session_ids'] and never
+    removes or replaces entries.
+
+    On teardown, every registered session that is still active (e.g.
+    complete_discovery keeps sessions open, or a test failed midway) is
+    removed from the registry and closed, so its BrowserContext is not
+    leaked. Requests playwright_browser so this runs before the browser
+    itself is closed.
+    """
+    holder = {'session_ids': []}
+    yield holder
+
+    from discovery_tools import _active_sessions
+    for session_id in holder['session_ids']:
+        session = _active_sessions.pop(session_id, None)
+        if session is not None:
+            await session.close()
+            logging.getLogger('federalscout.test').info(
+                f"Closed discovery session: {session_id}"
+            )
+
+
+@pytest_asyncio.fixture(scope='session', loop_scope='session')
+async def playwright_browser(test_config):
+    """
+    Launch ONE Playwright browser for the whole test session.
+
+    Browser launch dominates per-test setup; contexts are far cheaper.
+    Uses the configured engine (WebKit by default - FSA blocks headless
+    Chromium). All async tests run on the session event loop (see
+    pytest_collection_modifyitems), so the browser is usable everywhere.
+    """
+    from playwright.async_api import async_playwright
+
+    playwright = await async_playwright().start()
+    browser_engine = getattr(playwright, test_config.browser_type)
+    browser = await browser_engine.launch(
+        headless=test_config.headless,
+        slow_mo=test_config.slow_mo,
+        args=test_config.browser_args if test_config.browser_type == "chromium" else []
+    )
+
+    yield browser
+
+    await browser.close()
+    await playwright.stop()
 
 
 def pytest_configure(config):
@@ -69,12 +216,26 @@ def pytest_configure(config):
 
 
 def pytest_collection_modifyitems(config, items):
-    """Add markers to tests based on their names."""
+    """
+    Add markers to tests based on their names.
+
+    Also runs every async test on the session event loop (the same loop as
+    the session-scoped fixtures), so one loop - and one browser - spans the
+    whole suite instead of a new loop per test.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope='session')
     for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+        # Lowercase the node ID once per item
+        nodeid = item.nodeid.lower()
+        is_full = "full" in nodeid
+
         # Mark integration tests
-        if "integration" in item.nodeid.lower() or "full" in item.nodeid.lower():
+        if "integration" in nodeid or is_full:
             item.add_marker(pytest.mark.integration)
-        
+
         # Mark slow tests
-        if "full" in item.nodeid.lower() or "complete" in item.nodeid.lower():
+        if is_full or "complete" in nodeid:
             item.add_marker(pytest.mark.slow)
@@ -0,0 +1,51 @@
+"""
+Test the persistent browser profile launch path.
+
+When FEDERALSCOUT_USER_DATA_DIR is set, PlaywrightClient launches through
+launch_persistent_context instead of launch(). Verifies that:
+1. The profile directory is created and populated by the browser
+2. new_page() reuses the persistent context's initial page
+3. close() releases the page and context
+
+Each test gets its own profile under tmp_path: a profile directory can
+only be opened by one browser at a time.
+
+Run with: pytest tests/test_persistent_profile.py -v
+"""
+
+
+import pytest
+
+from playwright_client import PlaywrightClient
+
+
+@pytest.mark.xdist_group(name="persistent_profile")
+class TestPersistentProfile:
+    """Launch, use and close a browser with a persistent profile."""
+
+    @pytest.mark.asyncio
+    async def test_launch_persistent_context(self, test_config, tmp_path):
+        profile_dir = tmp_path / 'profile'
+        config = test_config.model_copy(update={
+            'user_data_dir': profile_dir,
+            'browser_endpoint': None,
+        })
+
+        client = PlaywrightClient(config)
+        try:
+            await client.launch()
+            assert client.context is not None
+            assert profile_dir.is_dir()
+            assert any(profile_dir.iterdir()), "browser did not write to the profile"
+
+            page = await client.new_page()
+            assert page in client.context.pages
+
+            await page.set_content("<h1>FederalScout</h1>")
+            assert await page.inner_text("h1") == "FederalScout"
+        finally:
+            await client.close()
+
+        assert page.is_closed()
+        assert client.context is None
+        assert client.playwright is None
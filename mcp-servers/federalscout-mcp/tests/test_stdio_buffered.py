@@ -0,0 +1,87 @@
+"""
+Test the buffered stdin reader over a real pipe.
+
+Verifies that:
+1. Lines split across read-buffer boundaries are reassembled
+2. A partial last line (no trailing newline) is delivered at EOF
+3. A line larger than the 64KB buffer arrives intact
+4. Non-pipe stdin falls back to the SDK's default reader
+
+Run with: pytest tests/test_stdio_buffered.py -v
+"""
+
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from stdio_buffered import STDIN_BUFFER_SIZE, open_buffered_stdin
+
+
+@pytest.fixture
+def stdin_pipe(monkeypatch):
+    """Replace sys.stdin with the read end of a pipe; yields the write fd."""
+    r_fd, w_fd = os.pipe()
+    stdin = os.fdopen(r_fd, 'r')
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    yield w_fd
+    stdin.close()
+    try:
+        os.close(w_fd)
+    except OSError:
+        pass  # Already closed by the test to signal EOF
+
+
+def _write_and_close(fd: int, chunks: list[bytes]) -> None:
+    for chunk in chunks:
+        os.write(fd, chunk)
+    os.close(fd)
+
+
+async def _read_lines(stdin_pipe: int, chunks: list[bytes], buffer_size: int = STDIN_BUFFER_SIZE) -> list[str]:
+    reader = await open_buffered_stdin(buffer_size)
+    assert reader is not None
+
+    # Write from a thread: payloads over the pipe capacity block until read
+    writer = asyncio.create_task(asyncio.to_thread(_write_and_close, stdin_pipe, chunks))
+    lines = [line async for line in reader]
+    await writer
+    return lines
+
+
+class TestBufferedStdin:
+    """Line splitting in BufferedStdinReader/_StdinProtocol."""
+
+    @pytest.mark.asyncio
+    async def test_lines_across_buffer_boundaries(self, stdin_pipe):
+        lines = ['{"id": 1, "method": "ping"}', '{"id": 2}', '', '{"name": "café ✓"}']
+        data = ''.join(line + '\n' for line in lines).encode('utf-8')
+
+        # A 5-byte buffer splits nearly every line, including the multi-byte characters
+        result = await _read_lines(stdin_pipe, [data], buffer_size=5)
+
+        assert result == lines
+
+    @pytest.mark.asyncio
+    async def test_partial_last_line_at_eof(self, stdin_pipe):
+        result = await _read_lines(stdin_pipe, [b'{"id": 1}\n{"id"', b': 2}'], buffer_size=8)
+
+        assert result == ['{"id": 1}', '{"id": 2}']
+
+    @pytest.mark.asyncio
+    async def test_line_larger_than_buffer(self, stdin_pipe):
+        big = '{"html": "' + 'x' * (3 * STDIN_BUFFER_SIZE + 17) + '"}'
+
+        result = await _read_lines(stdin_pipe, [b'{"id": 1}\n', big.encode() + b'\n', b'{"id": 3}\n'])
+
+        assert result == ['{"id": 1}', big, '{"id": 3}']
+
+    @pytest.mark.asyncio
+    async def test_non_pipe_stdin_falls_back(self, monkeypatch, tmp_path):
+        path = tmp_path / 'stdin.txt'
+        path.write_text('{"id": 1}\n')
+        with open(path) as stdin:
+            monkeypatch.setattr(sys, 'stdin', stdin)
+            assert await open_buffered_stdin() is None